@@ -0,0 +1,148 @@
+"""
+Word Ladder Service
+-------------------
+
+A long-lived, in-process front end for word_ladders queries. The word
+graph (word sets and wildcard indexes) stays loaded between queries,
+solved (begin_word, end_word) pairs are kept in an LRU cache, and each
+word length gets connected-component IDs so that impossible queries
+return None without searching.
+
+    with LadderService() as service:
+        future = service.submit("sail", "boat")
+        print(future.result())
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import word_ladders
+
+
+class LadderService:
+    def __init__(self, workers=4, cache_size=10000, solver=word_ladders.find_ladders_astar):
+        self.pool = ThreadPoolExecutor(workers)
+        self.solver = solver
+        self.cache = OrderedDict()  # (begin_word, end_word) -> ladder, least recent first
+        self.cache_size = cache_size
+        self.components = {}  # word length -> {word: component ID}
+        self.length_locks = {}  # word length -> lock held while its components are built
+        self.lock = threading.Lock()  # guards the cache, counters and dicts above, never held long
+        self.hits = 0
+        self.misses = 0
+
+    def preload(self, lengths):
+        """
+        Load the words, wildcard index and components for these
+        word lengths up front, instead of on their first query.
+        """
+        for length in lengths:
+            self.component_ids(length)
+
+    def component_ids(self, length):
+        """
+        Map every dictionary word of this length to a component ID;
+        two words have a ladder between them iff their IDs match.
+        """
+        with self.lock:
+            if length in self.components:
+                return self.components[length]
+            length_lock = self.length_locks.setdefault(length, threading.Lock())
+
+        # build outside the service lock, so queries for other lengths and
+        # cache hits go on meanwhile; same-length callers wait here
+        with length_lock:
+            with self.lock:
+                if length in self.components:
+                    return self.components[length]
+
+            components = {}
+            for word in word_ladders.get_word_set(length):
+                if word in components:
+                    continue
+                # flood the new component breadth-first
+                component_id = len(components)
+                components[word] = component_id
+                layer = [word]
+                while layer:
+                    next_layer = []
+                    for v in layer:
+                        for neighbor in word_ladders.get_neighbors(v):
+                            if neighbor not in components:
+                                components[neighbor] = component_id
+                                next_layer.append(neighbor)
+                    layer = next_layer
+
+            with self.lock:
+                self.components[length] = components
+            return components
+
+    def connected(self, begin_word, end_word):
+        """
+        O(len(word)) check whether any ladder can exist. begin_word does
+        not have to be in the dictionary, in which case any of its
+        neighbors' components counts.
+        """
+        if len(begin_word) != len(end_word):
+            return False
+        if begin_word == end_word:
+            return True
+
+        components = self.component_ids(len(end_word))
+        if end_word not in components:
+            return False
+        if begin_word in components:
+            return components[begin_word] == components[end_word]
+        return any(components[neighbor] == components[end_word]
+                   for neighbor in word_ladders.get_neighbors(begin_word))
+
+    def solve(self, begin_word, end_word):
+        """
+        Shortest ladder from begin_word to end_word, or None.
+        """
+        key = (begin_word, end_word)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                ladder = self.cache[key]
+                return list(ladder) if ladder is not None else None
+            self.misses += 1
+
+        ladder = self.solver(begin_word, end_word) if self.connected(begin_word, end_word) else None
+
+        with self.lock:
+            self.cache[key] = tuple(ladder) if ladder is not None else None
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        return ladder
+
+    def submit(self, begin_word, end_word):
+        """
+        Queue a query on the worker pool and return its Future.
+        """
+        return self.pool.submit(self.solve, begin_word, end_word)
+
+    def solve_many(self, pairs):
+        """
+        Answer a batch of (begin_word, end_word) queries, in order.
+        """
+        return list(self.pool.map(lambda pair: self.solve(*pair), pairs))
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == '__main__':
+    with LadderService() as service:
+        print(service.solve_many([("sail", "boat"), ("hit", "cog"), ("hit", "cog")]))
+        print(f"cache hits: {service.hits}, misses: {service.misses}")
@@ -0,0 +1,131 @@
+import unittest
+import os
+import tempfile
+import threading
+
+import word_ladders
+from ladder_service import LadderService
+from word_ladders import (find_ladders, find_ladders_astar, find_all_ladders,
+                          count_ladders, iter_ladders, get_neighbors, get_word_set)
+
+WORDS = """
+hit hot dot dog cog lot log cot hog hat cat
+sail bail boil boll bolt boat bait bat
+a b c
+"""
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        # point the module at a small fixture dictionary, with empty caches
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (word_ladders.WORDS_FILE, word_ladders.PARTITION_DIR)
+        word_ladders.WORDS_FILE = os.path.join(self.tmp.name, 'words.txt')
+        word_ladders.PARTITION_DIR = os.path.join(self.tmp.name, 'words_by_length')
+        with open(word_ladders.WORDS_FILE, 'w') as f:
+            f.write('\n'.join(WORDS.split()) + '\n')
+        word_ladders.word_sets.clear()
+        word_ladders.wildcard_indexes.clear()
+
+    def tearDown(self):
+        word_ladders.WORDS_FILE, word_ladders.PARTITION_DIR = self.saved
+        word_ladders.word_sets.clear()
+        word_ladders.wildcard_indexes.clear()
+        self.tmp.cleanup()
+
+    def assertLadder(self, ladder, begin_word, end_word):
+        self.assertEqual(ladder[0], begin_word)
+        self.assertEqual(ladder[-1], end_word)
+        for a, b in zip(ladder, ladder[1:]):
+            self.assertEqual(word_ladders.hamming(a, b), 1)
+            self.assertIn(b, get_word_set(len(b)))
+
+    def test_read_partition(self):
+        words = WORDS.split()
+        for length in (1, 3, 4, 5):
+            # scanning the full dictionary before preprocessing
+            self.assertEqual(word_ladders.read_partition(length),
+                             {w for w in words if len(w) == length})
+        word_ladders.preprocess_dictionary(word_ladders.WORDS_FILE, word_ladders.PARTITION_DIR)
+        os.remove(word_ladders.WORDS_FILE)  # only the partitions are left to read
+        for length in (1, 3, 4):
+            self.assertEqual(word_ladders.read_partition(length),
+                             {w for w in words if len(w) == length})
+
+    def test_get_neighbors(self):
+        words = WORDS.split()
+        for word in words:
+            expected = {w for w in words
+                        if len(w) == len(word) and word_ladders.hamming(w, word) == 1}
+            self.assertEqual(set(get_neighbors(word)), expected)
+        self.assertEqual(set(get_neighbors('hzt')), {'hit', 'hot', 'hat'})
+
+    def test_find_ladders(self):
+        self.assertEqual(len(find_ladders('hit', 'cog')), 4)
+        self.assertLadder(find_ladders('sail', 'boat'), 'sail', 'boat')
+        self.assertIsNone(find_ladders('hit', 'hzt'))
+
+    def test_find_ladders_astar(self):
+        words = WORDS.split()
+        for begin_word in words + ['hzt']:
+            for end_word in words + ['hzt']:
+                if len(begin_word) != len(end_word) or begin_word == end_word:
+                    continue
+                expected = find_ladders(begin_word, end_word)
+                ladder = find_ladders_astar(begin_word, end_word)
+                if expected is None:
+                    self.assertIsNone(ladder, (begin_word, end_word))
+                else:
+                    self.assertEqual(len(ladder), len(expected))
+                    self.assertLadder(ladder, begin_word, end_word)
+
+    def test_find_all_ladders(self):
+        dag = find_all_ladders('hit', 'cog')
+        ladders = list(iter_ladders(dag, 'hit', 'cog'))
+        # hit -> hot -> cot / hog -> cog
+        self.assertEqual(count_ladders(dag, 'hit', 'cog'), len(ladders))
+        self.assertEqual(len(ladders), 2)
+        for ladder in ladders:
+            self.assertEqual(len(ladder), len(find_ladders('hit', 'cog')))
+            self.assertLadder(ladder, 'hit', 'cog')
+        self.assertIsNone(find_all_ladders('hit', 'hzt'))
+
+    def test_ladder_service(self):
+        with LadderService(workers=2) as service:
+            self.assertTrue(service.connected('hit', 'cog'))
+            self.assertFalse(service.connected('hit', 'hzt'))
+            results = service.solve_many([('hit', 'cog'), ('sail', 'boat'), ('hit', 'hzt'), ('hit', 'cog')])
+            self.assertEqual([len(r) if r else r for r in results], [4, 6, None, 4])
+            self.assertEqual(service.submit('hit', 'cog').result(), results[0])
+            self.assertGreaterEqual(service.hits, 1)
+
+    def test_ladder_service_build_does_not_block(self):
+        with LadderService() as service:
+            service.solve('hit', 'cog')
+
+            # stall the component build for 4-letter words half way
+            building, release = threading.Event(), threading.Event()
+            get_neighbors = word_ladders.get_neighbors
+            def slow_neighbors(word):
+                if len(word) == 4:
+                    building.set()
+                    release.wait()
+                return get_neighbors(word)
+            word_ladders.get_neighbors = slow_neighbors
+            try:
+                builder = threading.Thread(target=service.component_ids, args=(4,))
+                builder.start()
+                building.wait()
+
+                # a cache hit answers while the build is still running
+                hit = threading.Thread(target=service.solve, args=('hit', 'cog'))
+                hit.start()
+                hit.join(timeout=5)
+                self.assertFalse(hit.is_alive())
+            finally:
+                release.set()
+                builder.join()
+                word_ladders.get_neighbors = get_neighbors
+
+if __name__ == '__main__':
+    unittest.main()
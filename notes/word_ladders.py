@@ -28,18 +28,12 @@ starting: sail
 ending: boat
 """
 
-class Queue():
-    def __init__(self):
-        self.queue = []
-    def enqueue(self, value):
-        self.queue.append(value)
-    def dequeue(self):
-        if self.size() > 0:
-            return self.queue.pop(0)
-        else:
-            return None
-    def size(self):
-        return len(self.queue)
+import heapq
+import os
+import sys
+
+sys.path.append('../projects/graph')
+from util import Queue, reconstruct_path
 
 def find_ladders(begin_word, end_word):  # BFS
     visited = set()
@@ -67,44 +61,244 @@ def find_ladders(begin_word, end_word):  # BFS
 
 
 
-word_set = set()
+WORDS_FILE = 'words.txt'
+PARTITION_DIR = 'words_by_length'  # written by preprocess_dictionary()
 
-# Read all words from the file and add them to the set
+# Nothing is read at import time: each word length is loaded the first
+# time a query needs it, and only that length is kept
+word_sets = {}         # word length -> set of words
+wildcard_indexes = {}  # word length -> wildcard index of those words
 
-with open('words.txt') as f:
-    for line in f:
-        word = line.strip()  # remove newlines
 
-        word_set.add(word)
+def preprocess_dictionary(words_file=WORDS_FILE, partition_dir=PARTITION_DIR):
+    """
+    Split the dictionary into one file per word length, so a query
+    only ever reads the words it can use
+    """
+    partitions = {}
+    with open(words_file) as f:
+        for line in f:
+            word = line.strip()  # remove newlines
+            if word:
+                partitions.setdefault(len(word), []).append(word)
 
-#letters = ['a', 'b', 'c'...
-import string
-letters = list(string.ascii_lowercase)
+    os.makedirs(partition_dir, exist_ok=True)
+    for length, words in partitions.items():
+        with open(os.path.join(partition_dir, f'{length}.txt'), 'w') as f:
+            f.write('\n'.join(sorted(set(words))) + '\n')
+
+
+def read_partition(length):
+    """
+    Read the words of one length: from the preprocessed partition file
+    if there is one, else by scanning the full dictionary
+    """
+    path = os.path.join(PARTITION_DIR, f'{length}.txt')
+    if os.path.exists(path):
+        with open(path) as f:
+            return set(f.read().split())
+
+    words = set()
+    with open(WORDS_FILE) as f:
+        for line in f:
+            word = line.strip()  # remove newlines
+            if len(word) == length:
+                words.add(word)
+    return words
+
+
+def get_word_set(length):
+    if length not in word_sets:
+        word_sets[length] = read_partition(length)
+    return word_sets[length]
 
-def get_neighbors(word):   # O(n^2) over word len
-    neighbors = []
 
-    string_word = list(word)   #  ['w', 'o', 'r', 'd']
+def get_wildcard_index(length):
+    if length not in wildcard_indexes:
+        wildcard_indexes[length] = build_wildcard_index(get_word_set(length))
+    return wildcard_indexes[length]
 
-    for i in range(len(string_word)):
 
-        for letter in letters:  # for every letter in the alphabet
-            temp_word = list(string_word)  # Make a copy that we can munge
+def wildcard_patterns(word):
+    """
+    Every way to blank out one letter of word: hot -> *ot, h*t, ho*
+    """
+    return [word[:i] + '*' + word[i + 1:] for i in range(len(word))]
 
-            temp_word[i] = letter
 
-            w = "".join(temp_word)  # Turn it back into a string
+def build_wildcard_index(words):
+    """
+    Map each wildcard pattern to the words that match it. Two words are
+    neighbors exactly when they share a pattern, so this is built once
+    and neighbor lookups become a few dict reads.
+    """
+    index = {}
+    for word in words:
+        for pattern in wildcard_patterns(word):
+            index.setdefault(pattern, []).append(word)
+    return index
 
-            if w == word:  # Words are not their own neighbors
-                continue
 
-            if w in word_set:
+def get_neighbors(word):   # O(len(word)) dict lookups
+    neighbors = []
+    wildcard_index = get_wildcard_index(len(word))
+
+    for pattern in wildcard_patterns(word):   #  h*t, *ot, ...
+        for w in wildcard_index.get(pattern, ()):
+            if w != word:  # Words are not their own neighbors
                 neighbors.append(w)
 
     return neighbors
 
 
-print(find_ladders("sail", "boat"))
-print(find_ladders("hit", "cog"))
+def hamming(a, b):
+    """
+    Number of positions where a and b differ. Every ladder step changes
+    one letter, so this never overestimates the steps left: an
+    admissible (and consistent) A* heuristic.
+    """
+    return sum(x != y for x, y in zip(a, b))
+
+
+def find_ladders_astar(begin_word, end_word):  # bidirectional A*
+    """
+    Same shortest ladder length as find_ladders, but searched from both
+    ends at once, each side ordered by steps taken + Hamming distance
+    to the other end's word, so far fewer words get expanded.
+    """
+    if len(begin_word) != len(end_word):
+        return None
+    if begin_word == end_word:
+        return [begin_word]
+    # the backward search starts at end_word, so it must be a real word
+    if end_word not in get_word_set(len(end_word)):
+        return None
+
+    # per side: open heap of (f, -g, word), best g, parents, closed words
+    sides = []
+    for start, target in ((begin_word, end_word), (end_word, begin_word)):
+        sides.append({
+            'open': [(hamming(start, target), 0, start)],
+            'g': {start: 0},
+            'parents': {start: None},
+            'closed': set(),
+            'target': target,
+        })
+
+    best = float('inf')  # length of the best ladder found so far
+    meet = None
+
+    while sides[0]['open'] and sides[1]['open']:
+        # no open word on either side can lead to anything shorter
+        if best <= max(sides[0]['open'][0][0], sides[1]['open'][0][0]):
+            break
+
+        # grow the side with less open work
+        i = 0 if len(sides[0]['open']) <= len(sides[1]['open']) else 1
+        side, other = sides[i], sides[1 - i]
+
+        _, g, v = heapq.heappop(side['open'])
+        g = -g
+        if v in side['closed'] or g > side['g'][v]:
+            continue  # stale heap entry
+        side['closed'].add(v)
+
+        for neighbor in get_neighbors(v):
+            new_g = g + 1
+            if new_g < side['g'].get(neighbor, float('inf')):
+                side['g'][neighbor] = new_g
+                side['parents'][neighbor] = v
+                heapq.heappush(side['open'], (new_g + hamming(neighbor, side['target']), -new_g, neighbor))
+
+                # the two searches touch: a complete ladder through neighbor
+                if neighbor in other['g'] and new_g + other['g'][neighbor] < best:
+                    best = new_g + other['g'][neighbor]
+                    meet = neighbor
+
+    if meet is None:
+        return None
+
+    path = reconstruct_path(sides[0]['parents'], meet)
+    tail = reconstruct_path(sides[1]['parents'], meet)
+    tail.reverse()
+    return path + tail[1:]
+
+
+def find_all_ladders(begin_word, end_word):
+    """
+    Every shortest ladder at once, without listing them.
+
+    Returns a dict mapping each word on some shortest ladder to the
+    words one step closer to begin_word on a shortest ladder (its
+    predecessors), or None if there is no ladder. Use count_ladders and
+    iter_ladders on the result; there can be exponentially many ladders.
+    """
+    if begin_word == end_word:
+        return {begin_word: []}
+
+    # layered BFS, remembering every shortest-path predecessor
+    predecessors = {begin_word: []}
+    layer = [begin_word]
+    while layer and end_word not in predecessors:
+        next_layer = {}
+        for v in layer:
+            for neighbor in get_neighbors(v):
+                if neighbor not in predecessors:
+                    next_layer.setdefault(neighbor, []).append(v)
+        predecessors.update(next_layer)
+        layer = list(next_layer)
+
+    if end_word not in predecessors:
+        return None
+
+    # keep only the words that actually lead to end_word
+    dag = {}
+    stack = [end_word]
+    while stack:
+        v = stack.pop()
+        if v not in dag:
+            dag[v] = predecessors[v]
+            stack.extend(predecessors[v])
+    return dag
+
+
+def count_ladders(dag, begin_word, end_word):
+    """
+    Number of shortest ladders in a find_all_ladders result, by dynamic
+    programming over the DAG instead of enumeration.
+    """
+    counts = {begin_word: 1}
+    stack = [end_word]
+    while stack:
+        v = stack[-1]
+        pending = [p for p in dag[v] if p not in counts]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        if v not in counts:
+            counts[v] = sum(counts[p] for p in dag[v])
+    return counts[end_word]
+
+
+def iter_ladders(dag, begin_word, end_word):
+    """
+    Lazily yield each shortest ladder in a find_all_ladders result.
+    """
+    # walk back from end_word; each stack entry is a partial reversed ladder
+    stack = [[end_word]]
+    while stack:
+        path = stack.pop()
+        v = path[-1]
+        if v == begin_word:
+            yield path[::-1]
+            continue
+        for p in dag[v]:
+            stack.append(path + [p])
+
+
+if __name__ == '__main__':
+    print(find_ladders("sail", "boat"))
+    print(find_ladders("hit", "cog"))
 
 
@@ -3,10 +3,13 @@ from player import Player
 from world import World
 
 import random
-from ast import literal_eval
+from map_loader import load_room_graph
+from traversal import find_traversal_path
 
 # Load world
 world = World()
+# from compact_world import CompactWorld
+# world = CompactWorld()  # array-backed rooms, for very large maps
 
 
 # You may uncomment the smaller graphs for development and testing purposes.
@@ -16,8 +19,8 @@ world = World()
 # map_file = "maps/test_loop_fork.txt"
 map_file = "maps/main_maze.txt"
 
-# Loads the map into a dictionary
-room_graph=literal_eval(open(map_file, "r").read())
+# Loads the map into a dictionary (.txt or .jsonl, see map_loader.py)
+room_graph = load_room_graph(map_file)
 world.load_graph(room_graph)
 
 # Print an ASCII map
@@ -27,7 +30,8 @@ player = Player(world.starting_room)
 
 # Fill this out with directions to walk
 # traversal_path = ['n', 'n']
-traversal_path = []
+# (branch-ordered DFS/BFS walk, then randomized restarts for time_budget seconds)
+traversal_path = find_traversal_path(room_graph, time_budget=1.0)
 
 
 
@@ -0,0 +1,202 @@
+"""
+Array-backed World for very large maps
+
+Instead of one Room object per room, CompactWorld keeps a struct of
+arrays: an int32 exits table with four slots per room (n, s, e, w; -1
+where there is no exit) and the x / y coordinates. Rooms handed out to
+Player and traversal code are thin RoomView objects that read from those
+arrays, are created on demand, and compare equal by room ID.
+
+Room IDs are expected to run from 0 to len(rooms) - 1, as in the
+bundled maps.
+"""
+from array import array
+
+from world import World
+
+DIRECTIONS = ("n", "s", "e", "w")
+SLOT = {direction: i for i, direction in enumerate(DIRECTIONS)}
+OPPOSITE = {"n": "s", "s": "n", "e": "w", "w": "e"}
+NO_ROOM = -1
+
+
+class RoomView:
+    """
+    Room-compatible view of one room in a CompactWorld.
+    """
+    __slots__ = ("world", "id")
+
+    def __init__(self, world, id):
+        self.world = world
+        self.id = id
+
+    @property
+    def name(self):
+        return f"Room {self.id}"
+
+    @property
+    def description(self):
+        return f"({self.x},{self.y})"
+
+    @property
+    def x(self):
+        return self.world.xs[self.id]
+
+    @property
+    def y(self):
+        return self.world.ys[self.id]
+
+    @property
+    def n_to(self):
+        return self.get_room_in_direction("n")
+
+    @property
+    def s_to(self):
+        return self.get_room_in_direction("s")
+
+    @property
+    def e_to(self):
+        return self.get_room_in_direction("e")
+
+    @property
+    def w_to(self):
+        return self.get_room_in_direction("w")
+
+    def __eq__(self, other):
+        return isinstance(other, RoomView) and other.world is self.world and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"RoomView({self.id})"
+
+    def __str__(self):
+        return f"\n-------------------\n\n{self.name}\n\n   {self.description}\n\n{self.get_exits_string()}\n"
+
+    def print_room_description(self, player):
+        print(str(self))
+
+    def get_exits(self):
+        # same order as Room.get_exits
+        exits = self.world.exits
+        base = self.id * 4
+        return [direction for direction in ("n", "s", "w", "e")
+                if exits[base + SLOT[direction]] != NO_ROOM]
+
+    def get_exits_string(self):
+        return f"Exits: [{', '.join(self.get_exits())}]"
+
+    def connect_rooms(self, direction, connecting_room):
+        if direction not in SLOT:
+            print("INVALID ROOM CONNECTION")
+            return None
+        self.world.connect(self.id, direction, connecting_room.id)
+
+    def get_room_in_direction(self, direction):
+        if direction not in SLOT:
+            return None
+        other = self.world.exits[self.id * 4 + SLOT[direction]]
+        return RoomView(self.world, other) if other != NO_ROOM else None
+
+    def get_coords(self):
+        return [self.x, self.y]
+
+
+class RoomTable:
+    """
+    Read-only, dict-like stand-in for World.rooms: room ID -> RoomView.
+    """
+    __slots__ = ("world",)
+
+    def __init__(self, world):
+        self.world = world
+
+    def __getitem__(self, room_id):
+        if not 0 <= room_id < len(self):
+            raise KeyError(room_id)
+        return RoomView(self.world, room_id)
+
+    def __contains__(self, room_id):
+        return isinstance(room_id, int) and 0 <= room_id < len(self)
+
+    def __len__(self):
+        return len(self.world.xs)
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+    def keys(self):
+        return range(len(self))
+
+    def values(self):
+        return (RoomView(self.world, room_id) for room_id in range(len(self)))
+
+    def items(self):
+        return ((room_id, RoomView(self.world, room_id)) for room_id in range(len(self)))
+
+
+class CompactWorld(World):
+    def __init__(self):
+        self.starting_room = None
+        self.exits = array("i")  # 4 slots per room: n, s, e, w
+        self.xs = array("i")
+        self.ys = array("i")
+        self.grid_size = 0
+
+    @property
+    def rooms(self):
+        return RoomTable(self)
+
+    @property
+    def room_coords(self):
+        """
+        (x, y) -> RoomView, built on demand (used by print_rooms).
+        """
+        return {(x, y): RoomView(self, room_id)
+                for room_id, (x, y) in enumerate(zip(self.xs, self.ys))}
+
+    def _reserve(self, room_id):
+        """
+        Grow the arrays so room_id has a slot.
+        """
+        missing = room_id + 1 - len(self.xs)
+        if missing > 0:
+            self.xs.extend(array("i", [0]) * missing)
+            self.ys.extend(array("i", [0]) * missing)
+            self.exits.extend(array("i", [NO_ROOM]) * (4 * missing))
+
+    def connect(self, room_id, direction, other_id):
+        """
+        Connect two rooms both ways, like Room.connect_rooms.
+        """
+        self._reserve(max(room_id, other_id))
+        self.exits[room_id * 4 + SLOT[direction]] = other_id
+        self.exits[other_id * 4 + SLOT[OPPOSITE[direction]]] = room_id
+
+    def load_rooms(self, entries):
+        """
+        Build the world from (room_id, (x, y), exits) entries, read once.
+        """
+        self.exits = table = array("i")
+        self.xs = xs = array("i")
+        self.ys = ys = array("i")
+        grid_size = 1
+        for room_id, (x, y), exits in entries:
+            # _reserve grows the arrays in place, so the local names stay valid
+            top = max(room_id, *exits.values()) if exits else room_id
+            if top >= len(xs):
+                self._reserve(top)
+            xs[room_id] = x
+            ys[room_id] = y
+            grid_size = max(grid_size, x, y)
+            base = room_id * 4
+            for direction, other_id in exits.items():
+                # inlined connect(), both ways
+                table[base + SLOT[direction]] = other_id
+                table[other_id * 4 + SLOT[OPPOSITE[direction]]] = room_id
+        self.grid_size = grid_size + 1
+        self.starting_room = RoomView(self, 0)
+
+    def room(self, room_id):
+        return self.rooms[room_id]
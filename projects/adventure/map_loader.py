@@ -0,0 +1,95 @@
+"""
+Map loading for the adventure World
+
+Maps come in two formats:
+
+  .txt    the original Python dict literal, {room_id: [(x, y), {dir: room_id}]}
+  .jsonl  one JSON array per line, [room_id, x, y, {dir: room_id}]
+
+Both are read one room at a time as (room_id, (x, y), exits) entries,
+so a map never has to be evaluated as a single giant literal.
+Convert a text map with `python map_loader.py maps/main_maze.txt maps/main_maze.jsonl`.
+"""
+from ast import literal_eval
+import json
+import sys
+
+
+def _parse_entries(text):
+    room = literal_eval("{" + text.rstrip(",") + "}")
+    return [(room_id, tuple(coords), exits) for room_id, (coords, exits) in room.items()]
+
+
+def iter_text_map(map_file):
+    """
+    Stream (room_id, (x, y), exits) entries from an original .txt map,
+    parsing one `room_id: [(x, y), {...}],` entry at a time. An entry
+    may span several lines.
+    """
+    with open(map_file, "r") as f:
+        entry = ""
+        for line in f:
+            line = line.strip()
+            if not entry:
+                line = line.lstrip("{")  # opening brace of the dict
+                if line in ("", "}"):
+                    continue
+            entry += line
+            try:
+                entries = _parse_entries(entry)
+            except (SyntaxError, ValueError):
+                continue  # entry not finished yet
+            entry = ""
+            yield from entries
+
+    # the closing brace may share a line with the last entry
+    if entry:
+        yield from _parse_entries(entry.rstrip().rstrip("}"))
+
+
+def iter_jsonl_map(map_file):
+    """
+    Stream (room_id, (x, y), exits) entries from a .jsonl map.
+    """
+    with open(map_file, "r") as f:
+        for line in f:
+            if line.strip():
+                room_id, x, y, exits = json.loads(line)
+                yield room_id, (x, y), exits
+
+
+def iter_map(map_file):
+    """
+    Stream (room_id, (x, y), exits) entries from a map in either format.
+    """
+    if map_file.endswith(".jsonl"):
+        return iter_jsonl_map(map_file)
+    return iter_text_map(map_file)
+
+
+def load_room_graph(map_file):
+    """
+    Load a map into the original {room_id: [(x, y), exits]} dictionary.
+    """
+    return {room_id: [coords, exits] for room_id, coords, exits in iter_map(map_file)}
+
+
+def write_jsonl_map(entries, jsonl_file):
+    """
+    Write (room_id, (x, y), exits) entries as a .jsonl map.
+    """
+    with open(jsonl_file, "w") as f:
+        for room_id, (x, y), exits in entries:
+            f.write(json.dumps([room_id, x, y, exits], separators=(",", ":")))
+            f.write("\n")
+
+
+def convert_map(text_file, jsonl_file):
+    """
+    Convert an original .txt map to the .jsonl format.
+    """
+    write_jsonl_map(iter_text_map(text_file), jsonl_file)
+
+
+if __name__ == "__main__":
+    convert_map(sys.argv[1], sys.argv[2])
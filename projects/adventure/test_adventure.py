@@ -0,0 +1,144 @@
+import unittest
+import glob
+import io
+import os
+import random
+import tempfile
+from ast import literal_eval
+from contextlib import redirect_stdout
+
+from map_loader import load_room_graph, iter_text_map, convert_map
+from compact_world import CompactWorld
+from world import World
+from player import Player
+from traversal import (find_traversal_path, search_traversal_paths, run_trial,
+                       build_exits, branch_heights)
+import validator
+
+MAPS = sorted(glob.glob('maps/*.txt'))
+
+def replay(room_graph, path):
+    """
+    The TRAVERSAL TEST from adv.py: (rooms visited, index of the first
+    move the Player could not make, or None).
+    """
+    world = World()
+    world.load_graph(room_graph)
+    player = Player(world.starting_room)
+    visited = {player.current_room}
+    first_invalid = None
+    for i, move in enumerate(path):
+        room = player.current_room
+        with redirect_stdout(io.StringIO()):
+            player.travel(move)
+        if player.current_room is room and first_invalid is None:
+            first_invalid = i
+        visited.add(player.current_room)
+    return len(visited), first_invalid
+
+def print_map(world):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        world.print_rooms()
+    return out.getvalue()
+
+class Test(unittest.TestCase):
+
+    def test_load_room_graph(self):
+        for map_file in MAPS:
+            with open(map_file) as f:
+                expected = literal_eval(f.read())
+            self.assertEqual(load_room_graph(map_file), expected)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # entries spread over several lines, closing brace on the last one
+            text_file = os.path.join(tmp, 'map.txt')
+            with open(text_file, 'w') as f:
+                f.write("{\n0: [(3, 5),\n {'n': 1}],\n1: [(3, 6), {'s': 0}]}\n")
+            self.assertEqual(list(iter_text_map(text_file)),
+                             [(0, (3, 5), {'n': 1}), (1, (3, 6), {'s': 0})])
+
+            jsonl_file = os.path.join(tmp, 'main_maze.jsonl')
+            convert_map('maps/main_maze.txt', jsonl_file)
+            self.assertEqual(load_room_graph(jsonl_file), load_room_graph('maps/main_maze.txt'))
+
+            world, streamed = World(), World()
+            world.load_graph(load_room_graph('maps/main_maze.txt'))
+            streamed.load_map(jsonl_file)
+            self.assertEqual(print_map(streamed), print_map(world))
+
+    def test_compact_world(self):
+        rng = random.Random(0)
+        for map_file in MAPS:
+            room_graph = load_room_graph(map_file)
+            world, compact = World(), CompactWorld()
+            world.load_graph(room_graph)
+            compact.load_graph(room_graph)
+            self.assertEqual(print_map(compact), print_map(world))
+            self.assertEqual(len(compact.rooms), len(world.rooms))
+
+            # players wander the same way through both worlds
+            player, compact_player = Player(world.starting_room), Player(compact.starting_room)
+            for _ in range(500):
+                move = rng.choice('nsew')
+                with redirect_stdout(io.StringIO()):
+                    player.travel(move)
+                    compact_player.travel(move)
+                room, compact_room = player.current_room, compact_player.current_room
+                self.assertEqual(compact_room.id, room.id)
+                self.assertEqual(compact_room.get_exits(), room.get_exits())
+                self.assertEqual(str(compact_room), str(room))
+
+    def test_find_traversal_path(self):
+        for map_file in MAPS:
+            room_graph = load_room_graph(map_file)
+            path = find_traversal_path(room_graph, time_budget=0)
+            self.assertEqual(replay(room_graph, path), (len(room_graph), None), map_file)
+
+    def test_one_way_exits(self):
+        # World links exits both ways, so room 0 has an exit north
+        room_graph = {0: [(0, 0), {}], 1: [(0, 1), {'s': 0}]}
+        self.assertEqual(find_traversal_path(room_graph, time_budget=0), ['n'])
+
+        room_graph = {0: [(0, 0), {}], 1: [(0, 1), {}]}
+        with self.assertRaises(ValueError):
+            find_traversal_path(room_graph, time_budget=0)
+
+    def test_search_traversal_paths(self):
+        room_graph = load_room_graph('maps/test_loop_fork.txt')
+        progress = []
+        path, trial = search_traversal_paths(room_graph, 50, seed=3, workers=1, batch_size=20,
+                                             progress=lambda *args: progress.append(args))
+        self.assertEqual(replay(room_graph, path), (len(room_graph), None))
+        self.assertEqual([done for done, total, moves in progress], [20, 40, 50])
+        self.assertEqual(progress[-1][2], len(path))
+
+        # same seed, same best path, however the trials are spread
+        self.assertEqual(search_traversal_paths(room_graph, 50, seed=3, workers=2, batch_size=7),
+                         (path, trial))
+        # and the winning trial can be replayed on its own
+        self.assertIsNotNone(trial)
+        exits = build_exits(room_graph)
+        self.assertEqual(run_trial(exits, 0, branch_heights(exits, 0), 3, trial), path)
+
+    def test_validate_path(self):
+        # room 9 declares 'n': 8, but room 8 does not declare 's': 9
+        room_graph = load_room_graph('maps/test_loop_fork.txt')
+        table = validator.exit_table(room_graph)
+        self.assertEqual(table[8 * 4 + validator.SLOT['s']], 9)
+
+        paths = [['w', 'w', 's'], ['n', 'x', 'n', 's', 'q'], [], ['e', 'e', 'e', 'e']]
+        paths.append(find_traversal_path(room_graph, time_budget=0))
+        for path in paths:
+            visited, first_invalid = validator.validate_path(table, path)
+            self.assertEqual((visited, first_invalid), replay(room_graph, path), path)
+
+        if validator.np is not None:
+            visited, first_invalid = validator.validate_paths_numpy(
+                table, validator.encode_paths(paths), chunk_size=2)
+            for path, v, f in zip(paths, visited, first_invalid):
+                expected_visited, expected_invalid = replay(room_graph, path)
+                self.assertEqual((v, f), (expected_visited, -1 if expected_invalid is None else expected_invalid))
+
+if __name__ == '__main__':
+    unittest.main()
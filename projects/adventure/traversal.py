@@ -0,0 +1,240 @@
+"""
+Automatic traversal_path solver for the adventure maze
+
+find_traversal_path walks depth-first into unexplored exits and, at a
+dead end, takes the shortest route (breadth-first search) back to the
+nearest unvisited room, as in the README hints. The order in which
+exits are explored decides how much backtracking is needed, so:
+
+  * exits are ranked by the height of the branch behind them in a
+    breadth-first spanning tree rooted at the start, so short branches
+    are cleared first and the walk ends at the bottom of the deepest
+    one instead of walking back out of it;
+  * the rest of the time budget is spent on randomized restarts that
+    perturb that ranking, keeping the shortest walk found.
+
+search_traversal_paths runs a fixed number of those restarts across a
+process pool. Trial i always draws from Random(seed, i), so a seed
+reproduces the same best path for any number of workers:
+
+    python traversal.py maps/main_maze.txt 20000 42
+"""
+import sys
+import random
+import time
+from multiprocessing import Pool
+
+sys.path.append('../graph')
+from util import Queue
+
+from compact_world import CompactWorld, SLOT, NO_ROOM
+
+NOISE_LEVELS = (0.5, 1.5, 3.0)  # how far a restart may reorder branches
+
+
+def build_exits(room_graph):
+    """
+    {room_id: {direction: room_id}} exits table from a loaded room graph.
+
+    Read off a CompactWorld loaded from it, so a room also gets the
+    exits that other rooms declare into it.
+    """
+    world = CompactWorld()
+    world.load_graph(room_graph)
+    table = world.exits
+    return {room_id: {direction: table[room_id * 4 + slot] for direction, slot in SLOT.items()
+                      if table[room_id * 4 + slot] != NO_ROOM}
+            for room_id in room_graph}
+
+
+def branch_heights(exits, start):
+    """
+    Height of every room's subtree in a breadth-first spanning tree
+    rooted at start (0 for leaves). Unreachable rooms are left out.
+    """
+    parents = {start: None}
+    order = []
+    q = Queue()
+    q.enqueue(start)
+    while q.size() > 0:
+        room = q.dequeue()
+        order.append(room)
+        for next_room in exits[room].values():
+            if next_room not in parents:
+                parents[next_room] = room
+                q.enqueue(next_room)
+
+    heights = dict.fromkeys(order, 0)
+    for room in reversed(order):
+        parent = parents[room]
+        if parent is not None:
+            heights[parent] = max(heights[parent], heights[room] + 1)
+    return heights
+
+
+def path_to_unvisited(exits, start, visited):
+    """
+    Shortest list of moves from start to the nearest room not in
+    visited, or None if every reachable room has been visited.
+    """
+    parents = {start: None}  # room -> (previous room, direction taken)
+    q = Queue()
+    q.enqueue(start)
+    while q.size() > 0:
+        room = q.dequeue()
+        if room not in visited:
+            moves = []
+            while parents[room] is not None:
+                room, direction = parents[room]
+                moves.append(direction)
+            moves.reverse()
+            return moves
+        for direction, next_room in exits[room].items():
+            if next_room not in parents:
+                parents[next_room] = (room, direction)
+                q.enqueue(next_room)
+    return None
+
+
+def explore(exits, start, heights, rng=None, noise=0.0):
+    """
+    One covering walk from start. Unexplored exits are taken lowest
+    branch first; with an rng, each branch height is jittered by up to
+    noise and ties are broken at random. Raises ValueError if some rooms
+    cannot be reached from start.
+    """
+    visited = {start}
+    path = []
+    room = start
+    while len(visited) < len(exits):
+        unexplored = [direction for direction, next_room in exits[room].items()
+                      if next_room not in visited]
+        if unexplored:
+            if rng is None:
+                direction = min(unexplored, key=lambda d: heights.get(exits[room][d], 0))
+            else:
+                direction = min(unexplored, key=lambda d: (
+                    heights.get(exits[room][d], 0) + rng.uniform(0, noise), rng.random()))
+            path.append(direction)
+            room = exits[room][direction]
+            visited.add(room)
+        else:
+            moves = path_to_unvisited(exits, room, visited)
+            if moves is None:
+                unreachable = sorted(set(exits) - visited)
+                raise ValueError(f"Rooms {unreachable} cannot be reached from room {start}")
+            for direction in moves:
+                room = exits[room][direction]
+            path.extend(moves)
+            visited.add(room)
+    return path
+
+
+def find_traversal_path(room_graph, start=0, time_budget=1.0, seed=None):
+    """
+    List of directions that visits every room of room_graph, starting
+    from start. The branch-ordered walk is always tried first; restarts
+    run until time_budget seconds have passed (0 for none). Raises
+    ValueError if some rooms cannot be reached from start.
+    """
+    exits = build_exits(room_graph)
+    heights = branch_heights(exits, start)
+    best = explore(exits, start, heights)
+
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget
+    while time.perf_counter() < deadline:
+        path = explore(exits, start, heights, rng, noise=rng.choice(NOISE_LEVELS))
+        if len(path) < len(best):
+            best = path
+    return best
+
+
+def run_trial(exits, start, heights, seed, trial):
+    """
+    The walk restart number trial of a seeded search takes. It seeds
+    its own Random from (seed, trial), so a best path reported by
+    search_traversal_paths can be rebuilt from those two numbers alone.
+    """
+    rng = random.Random(f"{seed}:{trial}")
+    return explore(exits, start, heights, rng, noise=rng.choice(NOISE_LEVELS))
+
+
+_search_state = None  # (exits, start, heights) in each worker process
+
+
+def _init_search(exits, start):
+    global _search_state
+    _search_state = (exits, start, branch_heights(exits, start))
+
+
+def _run_batch(task):
+    """
+    Worker for search_traversal_paths: runs trials first..first+count-1
+    and returns count and (moves, trial, path) for the shortest, earliest
+    trial.
+    """
+    seed, first, count = task
+    exits, start, heights = _search_state
+    best = None
+    for trial in range(first, first + count):
+        path = run_trial(exits, start, heights, seed, trial)
+        if best is None or len(path) < best[0]:
+            best = (len(path), trial, path)
+    return count, best
+
+
+def search_traversal_paths(room_graph, trials, seed, start=0, workers=None,
+                           batch_size=200, progress=None):
+    """
+    Seeded, multi-process randomized-restart search
+
+    Runs trials restarts in batches of batch_size on a process pool and
+    returns (path, trial) for the shortest walk, preferring the lowest
+    trial on ties; trial is None when no restart beats the branch-ordered
+    walk. progress(trials_done, trials, best_moves) is called after every
+    batch.
+
+    workers sizes the multiprocessing pool (None for one process per
+    CPU); with workers=1 the batches run here, without a pool.
+    """
+    exits = build_exits(room_graph)
+    best_path = explore(exits, start, branch_heights(exits, start))
+    best = (len(best_path), -1, best_path)
+
+    tasks = [(seed, first, min(batch_size, trials - first))
+             for first in range(0, trials, batch_size)]
+
+    def collect(results):
+        nonlocal best
+        done = 0
+        for count, result in results:
+            done += count
+            best = min(best, result, key=lambda r: (r[0], r[1]))
+            if progress is not None:
+                progress(done, trials, best[0])
+
+    if workers == 1:
+        _init_search(exits, start)
+        collect(map(_run_batch, tasks))
+    else:
+        with Pool(workers, initializer=_init_search, initargs=(exits, start)) as pool:
+            collect(pool.imap_unordered(_run_batch, tasks))
+
+    moves, trial, path = best
+    return path, (trial if trial >= 0 else None)
+
+
+if __name__ == "__main__":
+    from map_loader import load_room_graph
+
+    map_file, trials, seed = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    def report(done, total, moves):
+        print(f"{done}/{total} trials, best {moves} moves")
+
+    path, trial = search_traversal_paths(load_room_graph(map_file), trials, seed,
+                                         workers=workers, progress=report)
+    print(f"best: {len(path)} moves (seed {seed}, trial {trial})")
+    print(path)
@@ -0,0 +1,110 @@
+"""
+Fast traversal_path checking
+
+Replays paths against a flat exits table instead of stepping a Player
+through Room objects: room r's exit in direction d is
+table[r * 4 + SLOT[d]], -1 where there is none. This is the same layout
+as CompactWorld.exits, so a CompactWorld's table can be used directly.
+
+Moves follow Player.travel: an invalid move leaves the player where it
+is. Nothing is printed; the index of the first invalid move is returned
+instead.
+"""
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only validate_paths_numpy uses it
+    np = None
+
+from compact_world import CompactWorld, SLOT, NO_ROOM
+
+
+def exit_table(room_graph):
+    """
+    Flat int32 exits table for a {room_id: [(x, y), exits]} room graph,
+    with room IDs 0 to len(room_graph) - 1: the exits of a CompactWorld
+    loaded from it, so every exit is linked both ways as in World.
+    """
+    world = CompactWorld()
+    world.load_graph(room_graph)
+    return world.exits
+
+
+def validate_path(table, path, start=0):
+    """
+    Walk path from start. Returns (rooms_visited, first_invalid): the
+    number of distinct rooms visited, start included, and the index of
+    the first move that had no exit, or None if every move was valid.
+    """
+    seen = bytearray(len(table) // 4)
+    seen[start] = 1
+    visited = 1
+    first_invalid = None
+    room = start
+    for i, direction in enumerate(path):
+        slot = SLOT.get(direction)
+        next_room = table[room * 4 + slot] if slot is not None else NO_ROOM
+        if next_room == NO_ROOM:
+            if first_invalid is None:
+                first_invalid = i
+            continue
+        room = next_room
+        if not seen[room]:
+            seen[room] = 1
+            visited += 1
+    return visited, first_invalid
+
+
+def encode_paths(paths):
+    """
+    Pack paths into a (len(paths), longest) NumPy array of exit slots,
+    padded with -1. Unknown directions become 4, which is always invalid.
+    """
+    if np is None:
+        raise ImportError("encode_paths requires NumPy")
+    codes = np.full((len(paths), max(map(len, paths), default=0)), -1, dtype=np.int8)
+    for i, path in enumerate(paths):
+        codes[i, :len(path)] = [SLOT.get(direction, 4) for direction in path]
+    return codes
+
+
+def validate_paths_numpy(table, codes, start=0, chunk_size=4096):
+    """
+    validate_path for many paths at once, one vectorized step per move.
+
+    codes is an encode_paths array. Returns (rooms_visited,
+    first_invalid) arrays with one entry per path; first_invalid is -1
+    where every move was valid. Paths are checked chunk_size at a time,
+    which bounds the visited-room matrix to chunk_size * rooms booleans.
+    """
+    if np is None:
+        raise ImportError("validate_paths_numpy requires NumPy")
+    # one spare all -1 slot per room, for unknown directions
+    table = np.frombuffer(table, dtype=np.int32).reshape(-1, 4)
+    table = np.hstack([table, np.full((len(table), 1), NO_ROOM, dtype=np.int32)])
+
+    rooms_visited = np.empty(len(codes), dtype=np.int64)
+    first_invalid = np.empty(len(codes), dtype=np.int64)
+    for lo in range(0, len(codes), chunk_size):
+        hi = min(lo + chunk_size, len(codes))
+        rooms_visited[lo:hi], first_invalid[lo:hi] = _validate_chunk(table, codes[lo:hi], start)
+    return rooms_visited, first_invalid
+
+
+def _validate_chunk(table, codes, start):
+    num_paths, length = codes.shape
+    paths = np.arange(num_paths)
+    rooms = np.full(num_paths, start, dtype=np.int64)
+    seen = np.zeros((num_paths, len(table)), dtype=bool)
+    seen[:, start] = True
+    first_invalid = np.full(num_paths, -1, dtype=np.int64)
+
+    for step in range(length):
+        slots = codes[:, step]
+        moving = slots >= 0  # not padding
+        next_rooms = table[rooms, np.where(moving, slots, 4)]
+        invalid = moving & (next_rooms == NO_ROOM)
+        first_invalid[invalid & (first_invalid < 0)] = step
+        rooms = np.where(moving & ~invalid, next_rooms, rooms)
+        seen[paths, rooms] = True
+
+    return seen.sum(axis=1), first_invalid
@@ -1,4 +1,5 @@
 from room import Room
+from map_loader import iter_map
 import random
 import math
 
@@ -6,51 +7,47 @@ class World:
     def __init__(self):
         self.starting_room = None
         self.rooms = {}
-        self.room_grid = []
+        self.room_coords = {}  # (x, y) -> room, only for coordinates that hold a room
         self.grid_size = 0
     def load_graph(self, room_graph):
-        num_rooms = len(room_graph)
-        rooms = [None] * num_rooms
+        self.load_rooms((room_id, coords, exits) for room_id, (coords, exits) in room_graph.items())
+    def load_map(self, map_file):
+        """
+        Stream a .txt or .jsonl map file straight into the world.
+        """
+        self.load_rooms(iter_map(map_file))
+    def load_rooms(self, entries):
+        """
+        Build the world from (room_id, (x, y), exits) entries, read once.
+        """
+        self.rooms = {}
+        self.room_coords = {}
         grid_size = 1
-        for i in range(0, num_rooms):
-            x = room_graph[i][0][0]
-            grid_size = max(grid_size, room_graph[i][0][0], room_graph[i][0][1])
-            self.rooms[i] = Room(f"Room {i}", f"({room_graph[i][0][0]},{room_graph[i][0][1]})",i, room_graph[i][0][0], room_graph[i][0][1])
-        self.room_grid = []
-        grid_size += 1
-        self.grid_size = grid_size
-        for i in range(0, grid_size):
-            self.room_grid.append([None] * grid_size)
-        for room_id in room_graph:
-            room = self.rooms[room_id]
-            self.room_grid[room.x][room.y] = room
-            if 'n' in room_graph[room_id][1]:
-                self.rooms[room_id].connect_rooms('n', self.rooms[room_graph[room_id][1]['n']])
-            if 's' in room_graph[room_id][1]:
-                self.rooms[room_id].connect_rooms('s', self.rooms[room_graph[room_id][1]['s']])
-            if 'e' in room_graph[room_id][1]:
-                self.rooms[room_id].connect_rooms('e', self.rooms[room_graph[room_id][1]['e']])
-            if 'w' in room_graph[room_id][1]:
-                self.rooms[room_id].connect_rooms('w', self.rooms[room_graph[room_id][1]['w']])
+        connections = []
+        for room_id, (x, y), exits in entries:
+            grid_size = max(grid_size, x, y)
+            room = Room(f"Room {room_id}", f"({x},{y})", room_id, x, y)
+            self.rooms[room_id] = room
+            self.room_coords[(x, y)] = room
+            connections.extend((room_id, direction, exits[direction])
+                               for direction in ('n', 's', 'e', 'w') if direction in exits)
+        # rooms can point at rooms further down the map, so connect them last
+        for room_id, direction, other_id in connections:
+            self.rooms[room_id].connect_rooms(direction, self.rooms[other_id])
+        self.grid_size = grid_size + 1
         self.starting_room = self.rooms[0]
 
     def print_rooms(self):
-        rotated_room_grid = []
-        for i in range(0, len(self.room_grid)):
-            rotated_room_grid.append([None] * len(self.room_grid))
-        for i in range(len(self.room_grid)):
-            for j in range(len(self.room_grid[0])):
-                rotated_room_grid[len(self.room_grid[0]) - j - 1][i] = self.room_grid[i][j]
+        # rows from the top (largest y) down, skipping rows with no rooms
+        room_coords = self.room_coords
+        occupied_rows = {y for (x, y) in room_coords}
+        rows = []
+        for y in range(self.grid_size - 1, -1, -1):
+            if y in occupied_rows:
+                rows.append([room_coords.get((x, y)) for x in range(self.grid_size)])
         print("#####")
         str = ""
-        for row in rotated_room_grid:
-            all_null = True
-            for room in row:
-                if room is not None:
-                    all_null = False
-                    break
-            if all_null:
-                continue
+        for row in rows:
             # PRINT NORTH CONNECTION ROW
             str += "#"
             for room in row:
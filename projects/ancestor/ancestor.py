@@ -9,24 +9,230 @@
 # from graph import Graph
 # from util import Queue, Stack
 
-def earliest_ancestor(ancestors, root, parent=None):
-    # if starting node in tree
-    if root in [v[1] for v in ancestors]:
-        # iterate thru tree
-        for i in ancestors:
-            # starting node
-            if root == i[1]:
-                # when starting node found iterate up tree to lca
-                return earliest_ancestor(ancestors, i[0], parent=True)
-
-    # when lca reached        
-    elif parent == True:
-        return root
-
-    else:
-        # no lca found, input node has no parents
+
+class AncestorIndex:
+
+    """
+    Index over a list of (parent, child) pairs for repeated
+    earliest-ancestor queries.
+
+    Builds a child -> parents map once and memoizes each node's
+    earliest ancestor and its distance, so a query only walks the
+    part of the tree that has not been resolved yet.
+    """
+    def __init__(self, ancestors):
+        self.parents = {}
+        for parent, child in ancestors:
+            self.parents.setdefault(child, []).append(parent)
+        self.memo = {}  # node -> (earliest ancestor, distance)
+        self.line_parent = {}  # node -> parent its earliest ancestor is reached through
+
+    def _best(self, node):
+        """
+        Combine node's already-resolved parents into its memo entry.
+        """
+        best = (node, 0)
+        best_parent = None
+        for p in sorted(self.parents.get(node, ())):
+            ancestor, distance = self.memo[p]
+            # larger distance first, then lower ID (then lower parent ID)
+            if (distance + 1, -ancestor) > (best[1], -best[0]):
+                best = (ancestor, distance + 1)
+                best_parent = p
+        self.memo[node] = best
+        self.line_parent[node] = best_parent
+        return best
+
+    def resolve(self, node):
+        """
+        Return (earliest ancestor, distance) for node. A node with
+        no parents is its own earliest ancestor at distance 0.
+        Farthest ancestor wins, ties go to the lowest ID.
+        Raises ValueError if node's ancestry contains a cycle.
+        """
+        memo, parents = self.memo, self.parents
+        if node in memo:
+            return memo[node]
+
+        # explicit stack instead of recursion, so deep lines are fine;
+        # path holds the nodes currently being expanded, like a call stack
+        stack = [node]
+        path = []
+        on_path = set()
+        while stack:
+            v = stack[-1]
+            if v in memo:
+                # reached again through another child
+                stack.pop()
+                continue
+
+            if v not in on_path:
+                pending = [p for p in parents.get(v, ()) if p not in memo]
+                for p in pending:
+                    if p in on_path or p == v:
+                        cycle = path[path.index(p):] + [v] if p in on_path else [v]
+                        raise ValueError(f"Ancestors contain a cycle through {cycle}")
+                if pending:
+                    path.append(v)
+                    on_path.add(v)
+                    stack.extend(pending)
+                    continue
+            else:
+                path.pop()
+                on_path.discard(v)
+
+            stack.pop()
+            self._best(v)
+
+        return memo[node]
+
+    def resolve_all(self):
+        """
+        Resolve every node at once and return {node: (earliest ancestor,
+        distance)}, with -1 for nodes that have no parents.
+
+        Sorts the ancestry topologically (Kahn's algorithm, oldest
+        generation first) so each node is combined from its parents
+        exactly once, O(V + E) overall. Raises ValueError naming the
+        nodes on cycles if the data is not a DAG.
+        """
+        children = {}
+        remaining = {}  # node -> parents not yet placed in the order
+        for child, parents in self.parents.items():
+            remaining[child] = len(parents)
+            for p in parents:
+                children.setdefault(p, []).append(child)
+                remaining.setdefault(p, 0)
+
+        ready = [v for v, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            v = ready.pop()
+            order.append(v)
+            for child in children.get(v, ()):
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+
+        if len(order) < len(remaining):
+            raise ValueError(f"Ancestors contain a cycle through {self._cycle_nodes(remaining, children)}")
+
+        result = {}
+        for v in order:
+            ancestor, distance = self.memo[v] if v in self.memo else self._best(v)
+            result[v] = (ancestor if distance > 0 else -1, distance)
+        return result
+
+    def _cycle_nodes(self, remaining, children):
+        """
+        Nodes Kahn's algorithm could not place, minus the ones that are
+        only descendants of a cycle: peel off stuck nodes with no stuck
+        children until only cycles (and links between them) are left.
+        """
+        stuck = {v for v, count in remaining.items() if count > 0}
+        stuck_children = {v: sum(1 for c in children.get(v, ()) if c in stuck) for v in stuck}
+
+        leaves = [v for v in stuck if stuck_children[v] == 0]
+        while leaves:
+            v = leaves.pop()
+            stuck.discard(v)
+            for p in self.parents.get(v, ()):
+                if p in stuck:
+                    stuck_children[p] -= 1
+                    if stuck_children[p] == 0:
+                        leaves.append(p)
+
+        return sorted(stuck)
+
+    def earliest_ancestor(self, node):
+        """
+        Return node's earliest known ancestor, or -1 if it has no parents.
+        """
+        ancestor, distance = self.resolve(node)
+        return ancestor if distance > 0 else -1
+
+
+class LCAIndex:
+
+    """
+    Closest shared ancestor queries over a list of (parent, child)
+    pairs.
+
+    An individual counts as its own ancestor. The closest shared
+    ancestor of a and b is the one with the fewest generations to the
+    farther of a and b, then the fewest to both, then the lowest ID;
+    -1 means they share no ancestor (or a or b is unknown).
+
+    A genealogy is a DAG, not a tree: following one line per person
+    (as binary lifting over a tree would) loses shared ancestors reached
+    through the other parent. So a query walks up from a and b one
+    generation at a time, side by side, and stops at the first
+    generation where the two walks meet. Its cost is bounded by the
+    ancestors of a and b within the answer's distance, not by the size
+    of the tree.
+    """
+    def __init__(self, ancestors):
+        index = AncestorIndex(ancestors)
+        index.resolve_all()  # raises ValueError on cycles
+        self.parents = index.parents
+        self.known = set(index.memo)
+
+    def lca(self, a, b):
+        """
+        Return the closest shared ancestor of a and b, or -1.
+        """
+        if a not in self.known or b not in self.known:
+            return -1
+        parents = self.parents
+
+        # generations from a and from b to every ancestor walked so far
+        distances = ({a: 0}, {b: 0})
+        layers = ([a], [b])
+        generation = 0
+        while layers[0] or layers[1]:
+            # both walks now cover every ancestor up to this generation,
+            # so any meeting point at this generation is closest
+            found = [(generation, generation + distances[1 - side][v], v)
+                     for side in (0, 1)
+                     for v in layers[side] if v in distances[1 - side]]
+            if found:
+                return min(found)[2]
+
+            generation += 1
+            next_layers = ([], [])
+            for side in (0, 1):
+                for v in layers[side]:
+                    for p in parents.get(v, ()):
+                        if p not in distances[side]:
+                            distances[side][p] = generation
+                            next_layers[side].append(p)
+            layers = next_layers
+
         return -1
 
+    def lca_many(self, pairs):
+        """
+        Return the closest shared ancestor for each (a, b) in pairs.
+        """
+        return [self.lca(a, b) for a, b in pairs]
+
+
+def earliest_ancestor(ancestors, root):
+    """
+    Return the earliest known ancestor of root in the (parent, child)
+    list ancestors, or -1 if root has no parents. Build an
+    AncestorIndex directly to answer many queries on the same data.
+    """
+    return AncestorIndex(ancestors).earliest_ancestor(root)
+
+
+def earliest_ancestors(ancestors):
+    """
+    Return {individual: (earliest ancestor, distance)} for everyone in
+    the (parent, child) list ancestors, in one O(V + E) pass.
+    """
+    return AncestorIndex(ancestors).resolve_all()
+
 
 # Pseudocode
 # instantiate graph, add vertices/nodes to graph
@@ -37,7 +243,7 @@ def earliest_ancestor(ancestors, root, parent=None):
 # grab last vertex from path
 
 ############
-# actually i can avoid all of this with recursive implementaiton and adding another input
+# actually i can avoid all of this by indexing child -> parents once (AncestorIndex)
 
 if __name__ == "__main__":
     test_ancestors = [(1, 3), (2, 3), (3, 6), (5, 6), 
@@ -1,5 +1,5 @@
 import unittest
-from ancestor import earliest_ancestor
+from ancestor import earliest_ancestor, earliest_ancestors, AncestorIndex, LCAIndex
 
 class Test(unittest.TestCase):
 
@@ -26,5 +26,48 @@ class Test(unittest.TestCase):
         self.assertEqual(earliest_ancestor(test_ancestors, 10), -1)
         self.assertEqual(earliest_ancestor(test_ancestors, 11), -1)
 
+    def test_ancestor_index(self):
+        test_ancestors = [(1, 3), (2, 3), (3, 6), (5, 6), (5, 7), (4, 5), (4, 8), (8, 9), (11, 8), (10, 1)]
+        index = AncestorIndex(test_ancestors)
+        self.assertEqual(index.earliest_ancestor(6), 10)
+        self.assertEqual(index.resolve(6), (10, 3))
+        self.assertEqual(index.resolve(9), (4, 2))
+        self.assertEqual(index.earliest_ancestor(12), -1)
+
+    def test_deep_line(self):
+        test_ancestors = [(i + 1, i) for i in range(10000)]
+        self.assertEqual(earliest_ancestor(test_ancestors, 0), 10000)
+
+    def test_earliest_ancestors(self):
+        test_ancestors = [(1, 3), (2, 3), (3, 6), (5, 6), (5, 7), (4, 5), (4, 8), (8, 9), (11, 8), (10, 1)]
+        result = earliest_ancestors(test_ancestors)
+        for node in range(1, 12):
+            self.assertEqual(result[node][0], earliest_ancestor(test_ancestors, node))
+        self.assertEqual(result[6], (10, 3))
+
+    def test_cycle(self):
+        test_ancestors = [(1, 2), (2, 3), (3, 1), (3, 4)]
+        with self.assertRaisesRegex(ValueError, r"\[1, 2, 3\]"):
+            earliest_ancestors(test_ancestors)
+        with self.assertRaises(ValueError):
+            earliest_ancestor(test_ancestors, 4)
+
+    def test_lca(self):
+        test_ancestors = [(1, 3), (2, 3), (3, 6), (5, 6), (5, 7), (4, 5), (4, 8), (8, 9), (11, 8), (10, 1)]
+        index = LCAIndex(test_ancestors)
+        self.assertEqual(index.lca(6, 3), 3)
+        self.assertEqual(index.lca(9, 7), 4)
+        self.assertEqual(index.lca(10, 6), 10)
+        self.assertEqual(index.lca(7, 7), 7)
+        # 6 follows its line through 3 to 10, 7 through 5 to 4,
+        # but they share their parent 5
+        self.assertEqual(index.lca(6, 7), 5)
+        self.assertEqual(index.lca(6, 8), 4)
+        self.assertEqual(index.lca(3, 5), -1)
+        # 2 is 6's grandparent, off 6's earliest-ancestor line
+        self.assertEqual(index.lca(2, 6), 2)
+        self.assertEqual(LCAIndex([(1, 8), (0, 8), (8, 9), (2, 9)]).lca(1, 9), 1)
+        self.assertEqual(index.lca_many([(3, 1), (12, 1)]), [1, -1])
+
 if __name__ == '__main__':
     unittest.main()
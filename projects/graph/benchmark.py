@@ -0,0 +1,55 @@
+"""
+Breadth-first traversal timing at growing graph sizes
+
+Run with `python benchmark.py [max_vertices]`. With an O(1) queue the
+time per vertex should stay flat as the graph grows.
+"""
+import random
+import sys
+import time
+
+from csr import CSRGraph
+from graph import Graph
+
+
+def random_graph(num_vertices, avg_degree, seed=0):
+    """
+    Build a random directed graph with a spanning path, so that a
+    traversal from vertex 0 reaches every vertex.
+    """
+    rng = random.Random(seed)
+    graph = Graph()
+    for v in range(num_vertices):
+        graph.add_vertex(v)
+    for v in range(1, num_vertices):
+        graph.add_edge(v - 1, v)
+        for _ in range(avg_degree - 1):
+            graph.add_edge(v, rng.randrange(num_vertices))
+    return graph
+
+
+def time_bft(graph):
+    start = time.perf_counter()
+    count = sum(1 for _ in graph.iter_bft(0))
+    return count, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    max_vertices = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    sizes = []
+    n = max_vertices
+    while n >= 1000 and len(sizes) < 4:
+        sizes.append(n)
+        n //= 2
+    sizes.reverse()
+
+    print(f"{'vertices':>10} {'graph s':>9} {'ns/vertex':>10} {'csr s':>9} {'ns/vertex':>10}")
+    for n in sizes:
+        graph = random_graph(n, 4)
+        visited, seconds = time_bft(graph)
+        assert visited == n
+        csr_visited, csr_seconds = time_bft(CSRGraph.from_graph(graph))
+        assert csr_visited == n
+        print(f"{n:>10} {seconds:>9.3f} {seconds / n * 1e9:>10.0f} "
+              f"{csr_seconds:>9.3f} {csr_seconds / n * 1e9:>10.0f}")
@@ -0,0 +1,356 @@
+"""
+Compact, read-only graph stored in compressed sparse row (CSR) form
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only multi_source_distances uses it
+    np = None
+
+from graph import Graph
+from util import unique_edges_numpy, gather_rows_numpy
+
+
+def _index_typecode(num_vertices):
+    """
+    Pick the smallest signed array typecode that can hold a vertex index.
+    """
+    return 'i' if num_vertices < 2 ** 31 else 'q'
+
+
+def _counting_sort(num_vertices, keys, values, typecode):
+    """
+    Group values by their vertex key in O(V + E).
+
+    Returns (offsets, grouped) where the values for key i are
+    grouped[offsets[i]:offsets[i + 1]], in their original order.
+    """
+    # count each key, then prefix-sum the counts into offsets
+    offsets = array('q', [0]) * (num_vertices + 1)
+    for k in keys:
+        offsets[k + 1] += 1
+    for i in range(num_vertices):
+        offsets[i + 1] += offsets[i]
+
+    # drop every value into the next free slot of its key
+    grouped = array(typecode, [0]) * len(keys)
+    slots = offsets[:-1]
+    for k, v in zip(keys, values):
+        grouped[slots[k]] = v
+        slots[k] += 1
+
+    return offsets, grouped
+
+
+class CSRGraph(Graph):
+
+    """
+    Immutable graph frozen from a Graph.
+
+    Every vertex label is mapped to an integer index. The neighbors of the
+    vertex at index i live in neighbors[offsets[i]:offsets[i + 1]], so the
+    whole edge set is two flat arrays instead of one set per vertex.
+    """
+    def __init__(self, labels, offsets, neighbors, index=None):
+        self.labels = labels  # index -> label
+        self.offsets = offsets  # len(labels) + 1 edge offsets
+        self.neighbors = neighbors  # neighbor indices, grouped by vertex
+        if index is None:
+            index = {label: i for i, label in enumerate(labels)}
+        self.index = index  # label -> index
+        self.reverse = None  # (offsets, neighbors) of the transposed graph, built on demand
+        self.scc_index = None
+        self.connectivity = None  # built on first use
+        self.cache_listeners = []
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Freeze an existing Graph, keeping its neighbor iteration order.
+        """
+        labels = list(graph.vertices)
+        index = {label: i for i, label in enumerate(labels)}
+
+        offsets = array('q', [0])
+        neighbors = array(_index_typecode(len(labels)))
+
+        for label in labels:
+            neighbors.extend(index[edge] for edge in graph.vertices[label])
+            offsets.append(len(neighbors))
+
+        return cls(labels, offsets, neighbors, index)
+
+    @classmethod
+    def from_edge_list(cls, edges, vertices=()):
+        """
+        Build a frozen graph straight from an iterable of (v1, v2) edges,
+        without going through a dictionary of sets. Vertices are indexed
+        in order of first appearance and duplicate edges are dropped.
+        """
+        index = {}
+        labels = []
+        for vertex_id in vertices:
+            if vertex_id not in index:
+                index[vertex_id] = len(labels)
+                labels.append(vertex_id)
+
+        sources = array('q')
+        targets = array('q')
+        for v1, v2 in edges:
+            for v in (v1, v2):
+                if v not in index:
+                    index[v] = len(labels)
+                    labels.append(v)
+            sources.append(index[v1])
+            targets.append(index[v2])
+
+        typecode = _index_typecode(len(labels))
+        grouped_offsets, grouped = _counting_sort(len(labels), sources, targets, typecode)
+
+        # drop duplicate edges, keeping each vertex's first occurrence
+        offsets = array('q', [0])
+        neighbors = array(typecode)
+        for i in range(len(labels)):
+            neighbors.extend(dict.fromkeys(grouped[grouped_offsets[i]:grouped_offsets[i + 1]]))
+            offsets.append(len(neighbors))
+
+        return cls(labels, offsets, neighbors, index)
+
+    @classmethod
+    def from_numpy(cls, src, dst):
+        """
+        Build a frozen graph from parallel NumPy arrays of edge sources
+        and targets, entirely with vectorized NumPy operations.
+        """
+        labels, sources, targets = unique_edges_numpy(src, dst)
+        typecode = _index_typecode(len(labels))
+
+        bounds = np.searchsorted(sources, np.arange(len(labels) + 1))
+        offsets = array('q', bounds.astype(np.int64).tobytes())
+        neighbors = array(typecode, targets.astype(np.dtype(typecode)).tobytes())
+        return cls(labels.tolist(), offsets, neighbors)
+
+    @property
+    def vertices(self):
+        """
+        Dictionary of sets view of the graph, built on demand.
+        """
+        return {label: set(self.get_neighbors(label)) for label in self.labels}
+
+    def add_vertex(self, vertex_id):
+        raise TypeError("Cannot add a vertex to a frozen CSRGraph!")
+
+    def add_edge(self, v1, v2):
+        raise TypeError("Cannot add an edge to a frozen CSRGraph!")
+
+    def add_edges_from(self, edges, create_vertices=False):
+        raise TypeError("Cannot add edges to a frozen CSRGraph!")
+
+    def get_vertices(self):
+        """
+        Get all vertex labels.
+        """
+        return self.labels
+
+    def get_neighbors(self, vertex_id):
+        """
+        Get all neighbors (edges) of a vertex.
+        """
+        i = self.index[vertex_id]
+        labels = self.labels
+        return [labels[j] for j in self.neighbors[self.offsets[i]:self.offsets[i + 1]]]
+
+    def get_predecessors(self, vertex_id):
+        """
+        Get all vertices with an edge into a vertex.
+        """
+        if self.reverse is None:
+            self.reverse = self._transpose()
+        offsets, neighbors = self.reverse
+
+        i = self.index[vertex_id]
+        labels = self.labels
+        return [labels[j] for j in neighbors[offsets[i]:offsets[i + 1]]]
+
+    def iter_bft(self, starting_vertex, max_depth=None, with_depth=False, on_visit=None):
+        """
+        Graph.iter_bft over vertex indices: neighbors are scanned as
+        array slices and only mapped back to labels when yielded.
+        """
+        labels, offsets, neighbors = self.labels, self.offsets, self.neighbors
+        start = self.index[starting_vertex]
+        visited = bytearray(len(labels))
+        visited[start] = 1
+
+        # one level at a time, so depth needs no per-vertex bookkeeping
+        frontier = [start]
+        depth = 0
+        while frontier:
+            expand = max_depth is None or depth < max_depth
+            next_frontier = []
+            for i in frontier:
+                v = labels[i]
+                if on_visit is not None:
+                    on_visit(v, depth)
+                yield (v, depth) if with_depth else v
+
+                if expand:
+                    for j in neighbors[offsets[i]:offsets[i + 1]]:
+                        if not visited[j]:
+                            visited[j] = 1
+                            next_frontier.append(j)
+            frontier = next_frontier
+            depth += 1
+
+    def iter_dft(self, starting_vertex, max_depth=None, with_depth=False, on_visit=None):
+        """
+        Graph.iter_dft over vertex indices.
+        """
+        labels, offsets, neighbors = self.labels, self.offsets, self.neighbors
+        visited = bytearray(len(labels))
+        stack = [(self.index[starting_vertex], 0)]
+
+        while stack:
+            i, depth = stack.pop()
+            if not visited[i]:
+                visited[i] = 1
+                v = labels[i]
+                if on_visit is not None:
+                    on_visit(v, depth)
+                yield (v, depth) if with_depth else v
+
+                if max_depth is None or depth < max_depth:
+                    stack.extend((j, depth + 1) for j in neighbors[offsets[i]:offsets[i + 1]]
+                                 if not visited[j])
+
+    def bfs_tree(self, starting_vertex, destination_vertex=None):
+        """
+        Graph.bfs_tree over vertex indices; the parent map is only
+        turned into labels once the search is done.
+        """
+        labels, offsets, neighbors = self.labels, self.offsets, self.neighbors
+        start = self.index[starting_vertex]
+        destination = self.index.get(destination_vertex, -1)
+        parents = array(neighbors.typecode, [-1]) * len(labels)
+        parents[start] = start
+        order = [start]  # discovery order, doubles as the queue
+
+        for i in order:
+            if i == destination:
+                break
+            for j in neighbors[offsets[i]:offsets[i + 1]]:
+                if parents[j] < 0:
+                    parents[j] = i
+                    order.append(j)
+
+        tree = {starting_vertex: None}
+        for j in order[1:]:
+            tree[labels[j]] = labels[parents[j]]
+        return tree
+
+    def _transpose(self):
+        """
+        Build the offset and neighbor arrays of the reversed graph.
+        """
+        offsets, neighbors = self.offsets, self.neighbors
+        sources = array(neighbors.typecode)
+        for i in range(len(self.labels)):
+            sources.extend(array(neighbors.typecode, [i]) * (offsets[i + 1] - offsets[i]))
+        return _counting_sort(len(self.labels), neighbors, sources, neighbors.typecode)
+
+    def multi_source_distances(self, sources, use_numpy=False):
+        """
+        Array-backed multi-source breadth-first search.
+
+        Returns (distances, nearest) arrays indexed by vertex index (see
+        self.index): the hop distance to the closest source and the index
+        of that source, both -1 for unreached vertices. Ties go to the
+        source listed first, as in Graph.multi_source_bfs. With use_numpy
+        each level is expanded with vectorized NumPy operations and NumPy
+        arrays are returned.
+        """
+        if use_numpy and np is None:
+            raise ImportError("multi_source_distances(use_numpy=True) requires NumPy")
+
+        # sources as indices, without duplicates, in the order given
+        frontier = list(dict.fromkeys(self.index[source] for source in sources))
+
+        if use_numpy:
+            return self._multi_source_numpy(frontier)
+
+        num_vertices = len(self.labels)
+        offsets, neighbors = self.offsets, self.neighbors
+        distances = array('q', [-1]) * num_vertices
+        nearest = array(neighbors.typecode, [-1]) * num_vertices
+        for i in frontier:
+            distances[i] = 0
+            nearest[i] = i
+
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for i in frontier:
+                for j in neighbors[offsets[i]:offsets[i + 1]]:
+                    if distances[j] < 0:
+                        distances[j] = depth
+                        nearest[j] = nearest[i]
+                        next_frontier.append(j)
+            frontier = next_frontier
+
+        return distances, nearest
+
+    def _multi_source_numpy(self, frontier):
+        """
+        NumPy version of multi_source_distances, one sweep per level.
+        """
+        num_vertices = len(self.labels)
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        neighbors = np.frombuffer(self.neighbors, dtype=np.dtype(self.neighbors.typecode))
+
+        distances = np.full(num_vertices, -1, dtype=np.int64)
+        nearest = np.full(num_vertices, -1, dtype=neighbors.dtype)
+        frontier = np.array(frontier, dtype=np.int64)
+        distances[frontier] = 0
+        nearest[frontier] = frontier
+
+        depth = 0
+        while frontier.size:
+            depth += 1
+
+            # gather every frontier vertex's neighbor slice in one go
+            edges, counts = gather_rows_numpy(offsets, neighbors, frontier)
+            if edges.size == 0:
+                break
+            owners = np.repeat(nearest[frontier], counts)
+
+            # keep the first sighting of each undiscovered vertex, in
+            # discovery order, so ties match the pure Python version
+            unseen = distances[edges] < 0
+            edges, owners = edges[unseen], owners[unseen]
+            edges, first = np.unique(edges, return_index=True)
+            order = np.argsort(first, kind='stable')
+            edges, first = edges[order], first[order]
+
+            distances[edges] = depth
+            nearest[edges] = owners[first]
+            frontier = edges.astype(np.int64)
+
+        return distances, nearest
+
+    def __len__(self):
+        return len(self.labels)
+
+    def num_edges(self):
+        """
+        Number of directed edges stored in the graph.
+        """
+        return len(self.neighbors)
+
+    def nbytes(self):
+        """
+        Bytes used by the offset and neighbor arrays.
+        """
+        return (len(self.offsets) * self.offsets.itemsize
+                + len(self.neighbors) * self.neighbors.itemsize)
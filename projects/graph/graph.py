@@ -1,19 +1,57 @@
 """
 Simple graph implementation
 """
-from util import Stack, Queue  # These may come in handy
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only from_numpy uses it
+    np = None
+
+from util import (Stack, Queue, reconstruct_path, bidirectional_search, multi_source_bfs,
+                  unique_edges_numpy, ComponentIndex, DisjointSet)
 
 class Graph:
 
     """Represent a graph as a dictionary of vertices mapping labels to edges."""
     def __init__(self):
         self.vertices = {}
+        self.reverse_edges = {}  # vertex -> set of vertices with an edge into it
+        self.scc_index = None  # cached ComponentIndex of strongly connected components
+        self.connectivity = DisjointSet()  # weak components, kept up to date on insert
+        self.cache_listeners = []  # called with the graph whenever it changes
+
+    def add_cache_listener(self, callback):
+        """
+        Register callback(graph) to run whenever the graph changes,
+        so caches derived from it can be dropped.
+        """
+        self.cache_listeners.append(callback)
+
+    def invalidate_caches(self):
+        """
+        Drop the cached strongly connected components and notify listeners.
+        """
+        self.scc_index = None
+        for callback in self.cache_listeners:
+            callback(self)
 
     def add_vertex(self, vertex_id):
         """
         Add a vertex to the graph.
         """
+        # re-adding a vertex drops its outgoing edges, so unlink them
+        dropped = self.vertices.get(vertex_id)
+        for edge in dropped or ():
+            self.reverse_edges[edge].discard(vertex_id)
+
         self.vertices[vertex_id] = set() # set edges of this vert
+        self.reverse_edges.setdefault(vertex_id, set())
+
+        # union-find cannot split components, so rebuild it on demand
+        if dropped:
+            self.connectivity = None
+        elif self.connectivity is not None:
+            self.connectivity.add(vertex_id)
+        self.invalidate_caches()
 
     def add_edge(self, v1, v2):
         """
@@ -21,52 +59,170 @@ class Graph:
         """
         if v1 in self.vertices and v2 in self.vertices:
             self.vertices[v1].add(v2)  # set v2 as a neighbor of v1
+            self.reverse_edges[v2].add(v1)  # and v1 as a predecessor of v2
+            if self.connectivity is not None:
+                self.connectivity.union(v1, v2)
+            self.invalidate_caches()
         else: 
             raise IndexError("Cannot add an edge to a vertex that does not exist!")
 
+    def add_edges_from(self, edges, create_vertices=False):
+        """
+        Add many directed edges in one pass.
+
+        Edges already in the graph are skipped. A missing endpoint raises
+        IndexError like add_edge, unless create_vertices is set, in which
+        case it is added; edges before the failing one are kept. Returns
+        the number of new edges.
+        """
+        vertices, reverse_edges = self.vertices, self.reverse_edges
+        connectivity = self.connectivity
+        added = 0
+
+        try:
+            for v1, v2 in edges:
+                if v1 not in vertices or v2 not in vertices:
+                    if not create_vertices:
+                        raise IndexError("Cannot add an edge to a vertex that does not exist!")
+                    for v in (v1, v2):
+                        if v not in vertices:
+                            vertices[v] = set()
+                            reverse_edges[v] = set()
+                            if connectivity is not None:
+                                connectivity.add(v)
+
+                edges_out = vertices[v1]
+                if v2 not in edges_out:
+                    edges_out.add(v2)
+                    reverse_edges[v2].add(v1)
+                    if connectivity is not None:
+                        connectivity.union(v1, v2)
+                    added += 1
+        finally:
+            # edges before a failing one stay added, so caches must go either way
+            self.invalidate_caches()
+        return added
+
+    @classmethod
+    def from_edge_list(cls, edges, vertices=()):
+        """
+        Build a graph from an iterable of (v1, v2) edges, adding every
+        endpoint plus any extra (e.g. isolated) vertices given.
+        """
+        graph = cls()
+        for vertex_id in vertices:
+            graph.add_vertex(vertex_id)
+        graph.add_edges_from(edges, create_vertices=True)
+        return graph
+
+    @classmethod
+    def from_numpy(cls, src, dst):
+        """
+        Build a graph from parallel NumPy arrays of edge sources and
+        targets, deduplicating and grouping the edges with NumPy.
+        """
+        labels, sources, targets = unique_edges_numpy(src, dst)
+        num_vertices = len(labels)
+
+        graph = cls()
+        graph.vertices = cls._group_edges(labels, sources, targets, num_vertices)
+        order = np.lexsort((sources, targets))
+        graph.reverse_edges = cls._group_edges(labels, targets[order], sources[order], num_vertices)
+        graph.connectivity = None  # built on first use
+        return graph
+
+    @staticmethod
+    def _group_edges(labels, sources, targets, num_vertices):
+        """
+        Turn edges sorted by source into a dictionary of sets.
+        """
+        bounds = np.searchsorted(sources, np.arange(num_vertices + 1)).tolist()
+        target_labels = labels[targets].tolist()
+        return {label: set(target_labels[bounds[i]:bounds[i + 1]])
+                for i, label in enumerate(labels.tolist())}
+
+    def get_vertices(self):
+        """
+        Get all vertex labels.
+        """
+        return self.vertices.keys()
+
     def get_neighbors(self, vertex_id):
         """
         Get all neighbors (edges) of a vertex.
         """
         return self.vertices[vertex_id]
 
-    def bft(self, starting_vertex):
+    def get_predecessors(self, vertex_id):
         """
-        breadth-first traversal
-        Print each vertex in breadth-first order
+        Get all vertices with an edge into a vertex.
+        """
+        return self.reverse_edges[vertex_id]
+
+    def freeze(self):
+        """
+        Return an immutable, array-backed CSR copy of the graph.
+        """
+        from csr import CSRGraph
+        return CSRGraph.from_graph(self)
+
+    def iter_bft(self, starting_vertex, max_depth=None, with_depth=False, on_visit=None):
+        """
+        breadth-first traversal generator
+        Lazily yield each vertex in breadth-first order
         beginning from starting_vertex.
+
+        max_depth stops the traversal from expanding vertices that many
+        edges away from starting_vertex. with_depth yields
+        (vertex, depth) pairs instead of bare vertices. on_visit, if
+        given, is called as on_visit(vertex, depth) for every vertex
+        before it is yielded. Nothing past the last consumed vertex is
+        explored, so breaking out of the loop ends the traversal.
         """
-        # instantaite empty queue and enqueue the starting node
+        # instantiate empty queue and enqueue the starting node at depth 0
         q = Queue()
-        q.enqueue(starting_vertex)
+        q.enqueue((starting_vertex, 0))
 
-        # create set to store visited vertices
-        visited = set()
+        # vertices are marked as soon as they are discovered
+        visited = {starting_vertex}
 
-        while q.size() > 0: # while queue not empty
+        while q.size() > 0:
             # dequeue first vertex
-            v = q.dequeue()
-            
-            # if it hasn't been visited
-            if v not in visited:
-                # visit it <3 and add to visited set
-                visited.add(v)
-                # print(f"BFT Visited {v}")
-                print(v)
+            v, depth = q.dequeue()
 
-                # add all neighbors to end of the queue
+            # visit it <3
+            if on_visit is not None:
+                on_visit(v, depth)
+            yield (v, depth) if with_depth else v
+
+            # add undiscovered neighbors to end of the queue
+            if max_depth is None or depth < max_depth:
                 for edge in self.get_neighbors(v):
-                    q.enqueue(edge)
+                    if edge not in visited:
+                        visited.add(edge)
+                        q.enqueue((edge, depth + 1))
 
-    def dft(self, starting_vertex):
+    def bft(self, starting_vertex):
         """
-        depth-first traversal with a stack
-        Print each vertex in depth-first order
+        breadth-first traversal
+        Print each vertex in breadth-first order
+        beginning from starting_vertex.
+        """
+        for v in self.iter_bft(starting_vertex):
+            print(v)
+
+    def iter_dft(self, starting_vertex, max_depth=None, with_depth=False, on_visit=None):
+        """
+        depth-first traversal generator with a stack
+        Lazily yield each vertex in depth-first order
         beginning from starting_vertex.
+
+        Takes the same max_depth, with_depth and on_visit options as
+        iter_bft; depth is the depth in the depth-first tree.
         """
-        # instantaite empty stack and push the starting node
+        # instantaite empty stack and push the starting node at depth 0
         s = Stack()
-        s.push(starting_vertex)
+        s.push((starting_vertex, 0))
 
         # create a set to store the visited nodes
         visited = set()
@@ -74,37 +230,100 @@ class Graph:
         # while stack not empty
         while s.size() > 0:
             # pop the first item
-            v = s.pop()
+            v, depth = s.pop()
             # if it's not been visited:
             if v not in visited:
                 # visit it <3 and add to visited set
                 visited.add(v)
-                # print(f"DFT Visited {v}")
-                print(v)
+                if on_visit is not None:
+                    on_visit(v, depth)
+                yield (v, depth) if with_depth else v
 
-                # add all neighbors to end of the stack
-                for edge in self.get_neighbors(v):
-                    s.push(edge)
+                # add unvisited neighbors to end of the stack
+                if max_depth is None or depth < max_depth:
+                    for edge in self.get_neighbors(v):
+                        if edge not in visited:
+                            s.push((edge, depth + 1))
+
+    def dft(self, starting_vertex):
+        """
+        depth-first traversal with a stack
+        Print each vertex in depth-first order
+        beginning from starting_vertex.
+        """
+        for v in self.iter_dft(starting_vertex):
+            print(v)
+
+    def _recursive_frames(self, starting_vertex, visited):
+        """
+        Explicit-stack stand-in for a recursive depth-first walk.
+
+        Yields the stack of (vertex, neighbor iterator) frames each time a
+        new vertex is visited, in exactly the order the recursive version
+        visits them. The vertices on the stack are the current path.
+        """
+        visited.add(starting_vertex)
+        stack = [(starting_vertex, iter(self.get_neighbors(starting_vertex)))]
+        yield stack
+
+        while stack:
+            # resume the innermost "call" where it left off
+            for edge in stack[-1][1]:
+                if edge not in visited:
+                    # "recurse" into the first unvisited neighbor
+                    visited.add(edge)
+                    stack.append((edge, iter(self.get_neighbors(edge))))
+                    yield stack
+                    break
+            else:
+                # neighbors exhausted, "return" to the caller
+                stack.pop()
 
     def dft_recursive(self, starting_vertex, visited=None):
         """
-        depth-first traversal with recusion
+        depth-first traversal in recursive order
         Print each vertex in depth-first order
         beginning from starting_vertex.
+
+        Uses an explicit stack, so deep graphs do not hit
+        the interpreter recursion limit.
         """
         # create set
         if visited is None:
             visited = set()
-        
-        # visit and add vertex to visited set
-        # print(f"DFT Recusive Visted: {starting_vertex}")
-        print(starting_vertex)
-        visited.add(starting_vertex)
 
-        # recusively visit and add to set for all neighbors
-        for edge in self.vertices[starting_vertex]:
-            if edge not in visited:
-                self.dft_recursive(edge, visited)
+        for stack in self._recursive_frames(starting_vertex, visited):
+            print(stack[-1][0])
+
+    def bfs_tree(self, starting_vertex, destination_vertex=None):
+        """
+        breadth-first search tree
+        Return a dictionary mapping every vertex reached from
+        starting_vertex to the vertex it was discovered from
+        (starting_vertex maps to None). Stops early once
+        destination_vertex is reached.
+        """
+        # instantiate empty queue and enqueue the starting node
+        q = Queue()
+        q.enqueue(starting_vertex)
+
+        # predecessor map, doubles as the visited set
+        parents = {starting_vertex: None}
+
+        while q.size() > 0:
+            v = q.dequeue()
+
+            # check if vertex is the target
+            if v == destination_vertex:
+                break
+
+            # record where each new neighbor was discovered from
+            for edge in self.get_neighbors(v):
+                if edge not in parents:
+                    parents[edge] = v
+                    q.enqueue(edge)
+
+        return parents
 
     def bfs(self, starting_vertex, destination_vertex):
         """
@@ -113,78 +332,170 @@ class Graph:
         starting_vertex to destination_vertex in
         breath-first order.
         """
-        # instantiate empty queue and enqueue path to the starting node
-        q = Queue()
-        q.enqueue([starting_vertex])
+        parents = self.bfs_tree(starting_vertex, destination_vertex)
+        return reconstruct_path(parents, destination_vertex)
 
-        # create set to store visited vertices
-        visited = set()
+    def bidirectional_bfs(self, starting_vertex, destination_vertex):
+        """
+        bidirectional breadth-first search
+        Return a list containing the shortest path from
+        starting_vertex to destination_vertex, searching forward
+        from the start and backward from the destination until
+        the two frontiers meet.
+        """
+        return bidirectional_search(starting_vertex, destination_vertex,
+                                    self.get_neighbors, self.get_predecessors)
 
-        while q.size() > 0:
-            path = q.dequeue() # dequeue first path
+    def multi_source_bfs(self, starting_vertices):
+        """
+        multi-source breadth-first search
+        Return (distances, nearest) dictionaries giving, for every
+        vertex reachable from any of starting_vertices, the hop
+        distance to the closest one and which one that is.
+        """
+        return multi_source_bfs(starting_vertices, self.get_neighbors)
 
-            # grab last item from end of path
-            v = path[-1]
-            
-            # if that vertex hasn't been visited
-            if v not in visited:
-                # visit it <3 and mark as visited
-                visited.add(v)
-                
-                # check if vertex is the target
-                if v == destination_vertex:
-                    # if so, return path
-                    return path
-                
-                # add a path to neighbors queue
+    def strongly_connected_components(self):
+        """
+        Tarjan's algorithm
+        Return a list of strongly connected components (lists of
+        vertices), each listed after every component it has edges into.
+        """
+        index = {}  # vertex -> order of discovery
+        low = {}  # vertex -> lowest index reachable through its subtree
+        stack = []
+        on_stack = set()
+        components = []
+
+        for root in self.get_vertices():
+            if root in index:
+                continue
+
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            # explicit call stack of (vertex, neighbor iterator) frames
+            work = [(root, iter(self.get_neighbors(root)))]
+
+            while work:
+                v, edges = work[-1]
+                for edge in edges:
+                    if edge not in index:
+                        index[edge] = low[edge] = len(index)
+                        stack.append(edge)
+                        on_stack.add(edge)
+                        work.append((edge, iter(self.get_neighbors(edge))))
+                        break
+                    elif edge in on_stack:
+                        low[v] = min(low[v], index[edge])
+                else:
+                    work.pop()
+                    if work:
+                        caller = work[-1][0]
+                        low[caller] = min(low[caller], low[v])
+
+                    # v is the root of a component: pop it off the stack
+                    if low[v] == index[v]:
+                        component = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            component.append(w)
+                            if w == v:
+                                break
+                        components.append(component)
+
+        return components
+
+    def component_index(self):
+        """
+        Return a ComponentIndex of the strongly connected components,
+        computed once and reused until the graph changes.
+        """
+        if self.scc_index is None:
+            self.scc_index = ComponentIndex(self.strongly_connected_components())
+        return self.scc_index
+
+    def get_connectivity(self):
+        """
+        Return the DisjointSet of weakly connected components (the
+        components when edges are added in both directions for
+        undirected use). It is updated on every insert and only rebuilt
+        if add_vertex dropped edges.
+        """
+        if self.connectivity is None:
+            connectivity = DisjointSet(self.get_vertices())
+            for v in self.get_vertices():
                 for edge in self.get_neighbors(v):
-                    new_path = list(path) # copy path
-                    new_path.append(edge) # append the neighbor to the end
-                    q.enqueue(new_path)
+                    connectivity.union(v, edge)
+            self.connectivity = connectivity
+        return self.connectivity
 
-    def dfs(self, starting_vertex, destination_vertex):
+    def weakly_connected(self, v1, v2):
         """
-        deapth-first search
-        Return a list containing a path from
-        starting_vertex to destination_vertex in
-        depth-first order.
+        Return True if v1 and v2 are joined by edges in either direction.
         """
-        # instantiate empty stack and push the starting node
+        return self.get_connectivity().connected(v1, v2)
+
+    def component_size(self, vertex_id):
+        """
+        Number of vertices weakly connected to vertex_id, itself included.
+        """
+        return self.get_connectivity().set_size(vertex_id)
+
+    def dfs_tree(self, starting_vertex, destination_vertex=None):
+        """
+        depth-first search tree
+        Return a dictionary mapping every vertex reached from
+        starting_vertex to the vertex it was visited from
+        (starting_vertex maps to None). Stops early once
+        destination_vertex is reached.
+        """
+        # instantiate empty stack and push the starting node with no parent
         s = Stack()
-        s.push([starting_vertex])
+        s.push((starting_vertex, None))
 
-        # create a set to store the visited nodes
-        visited = set()
+        # predecessor map, doubles as the visited set
+        parents = {}
 
         while s.size() > 0:
-            # pop first vertex in path
-            path = s.pop()
-            
-            # grab last item from end of path
-            v = path[-1]
+            v, parent = s.pop()
 
             # if that vertex hasn't been visited
-            if v not in visited:
-                # visit it and mark as visited
-                visited.add(v)
+            if v not in parents:
+                # visit it and remember where we came from
+                parents[v] = parent
 
                 # check if vertex is the target
                 if v == destination_vertex:
-                    # if so, return path
-                    return path
-                
-                # add path to neighbors stack
+                    break
+
+                # push unvisited neighbors along with their parent
                 for edge in self.get_neighbors(v):
-                    new_path = list(path) # copy path
-                    new_path.append(edge) # append the neighbor to the end
-                    s.push(new_path)          
+                    if edge not in parents:
+                        s.push((edge, v))
+
+        return parents
+
+    def dfs(self, starting_vertex, destination_vertex):
+        """
+        deapth-first search
+        Return a list containing a path from
+        starting_vertex to destination_vertex in
+        depth-first order.
+        """
+        parents = self.dfs_tree(starting_vertex, destination_vertex)
+        return reconstruct_path(parents, destination_vertex)
 
     def dfs_recursive(self, starting_vertex, destination_vertex, visited=None, path=None):
         """
-        deapth-first search with recursion
+        deapth-first search in recursive order
         Return a list containing a path from
         starting_vertex to destination_vertex in
         depth-first order.
+
+        Uses an explicit stack, so deep graphs do not hit
+        the interpreter recursion limit.
         """
         # create new set
         if visited is None:
@@ -194,26 +505,13 @@ class Graph:
         if path is None:
             path = []
 
-        # keeping track of visited vertices
-        visited.add(starting_vertex)
-        path = path + [starting_vertex]
-
-        # check if vertex is the target
-        if starting_vertex == destination_vertex:
-            # if so, return path
-            return path
-
-        # if not, iterate recurively thru remaining vertices
-        for edge in self.vertices[starting_vertex]:
-            if edge not in visited:
-                new_path = self.dfs_recursive(edge, destination_vertex, visited, path)
-
-                # if new path exists
-                if new_path:
-                    return new_path
-        
-        return None
+        for stack in self._recursive_frames(starting_vertex, visited):
+            # check if vertex is the target
+            if stack[-1][0] == destination_vertex:
+                # if so, the stack holds the path
+                return path + [v for v, _ in stack]
 
+        return None
 
 if __name__ == '__main__':
     graph = Graph()  # Instantiate your graph
@@ -1,7 +1,9 @@
 import unittest
 import sys
 import io
-from graph import Graph
+from graph import Graph, np
+from csr import CSRGraph
+from util import Queue, Stack, reconstruct_path
 
 class Test(unittest.TestCase):
     def setUp(self):
@@ -38,6 +40,50 @@ class Test(unittest.TestCase):
         }
         self.assertDictEqual(self.graph.vertices, vertices)
 
+    def test_from_edge_list(self):
+        edges = [(5, 3), (6, 3), (7, 1), (4, 7), (1, 2), (7, 6),
+                 (2, 4), (3, 5), (2, 3), (4, 6), (2, 3), (4, 6)]
+        graph = type(self.graph).from_edge_list(edges)
+        self.assertDictEqual(graph.vertices, self.graph.vertices)
+
+        graph = Graph()
+        graph.add_vertex(1)
+        with self.assertRaises(IndexError):
+            graph.add_edges_from([(1, 2)])
+        self.assertEqual(graph.add_edges_from([(1, 2), (2, 1), (1, 2)], create_vertices=True), 2)
+
+        # a failed batch keeps its earlier edges and still drops the caches
+        graph = Graph()
+        graph.add_vertex(1)
+        graph.add_vertex(2)
+        self.assertFalse(graph.component_index().same_component(1, 2))
+        with self.assertRaises(IndexError):
+            graph.add_edges_from([(1, 2), (2, 1), (1, 99)])
+        self.assertTrue(graph.component_index().same_component(1, 2))
+
+    @unittest.skipUnless(np, "needs NumPy")
+    def test_from_numpy(self):
+        # duplicates and self-loops load the same as one add_edge each
+        edges = [(5, 3), (6, 3), (7, 1), (4, 7), (1, 2), (7, 6), (7, 7),
+                 (2, 4), (3, 5), (2, 3), (4, 6), (2, 3), (4, 6), (7, 7)]
+        expected = Graph()
+        for v in range(1, 8):
+            expected.add_vertex(v)
+        for v1, v2 in edges:
+            expected.add_edge(v1, v2)
+
+        src, dst = np.array(edges).T
+        graph = type(self.graph).from_numpy(src, dst)
+        self.assertDictEqual(graph.vertices, expected.vertices)
+        for v in expected.vertices:
+            self.assertEqual(set(graph.get_predecessors(v)), expected.reverse_edges[v])
+        self.assertTrue(graph.weakly_connected(1, 5))
+        self.assertEqual(graph.component_size(1), 7)
+
+        # labels need not be 0..n-1
+        graph = type(self.graph).from_numpy(np.array([30, 10, 30]), np.array([10, 20, 10]))
+        self.assertDictEqual(graph.vertices, {10: {20}, 20: set(), 30: {10}})
+
     def test_bft(self):
         bft = [
             "1\n2\n3\n4\n5\n6\n7\n",
@@ -97,10 +143,75 @@ class Test(unittest.TestCase):
 
         sys.stdout = stdout_  # Restore stdout
 
+    def test_iter_bft(self):
+        order = list(self.graph.iter_bft(1))
+        self.assertEqual(order[:2], [1, 2])
+        self.assertEqual(set(order), {1, 2, 3, 4, 5, 6, 7})
+
+        depths = dict(self.graph.iter_bft(1, with_depth=True))
+        self.assertEqual(depths, {1: 0, 2: 1, 3: 2, 4: 2, 5: 3, 6: 3, 7: 3})
+        self.assertEqual(set(self.graph.iter_bft(1, max_depth=1)), {1, 2})
+
+    def test_iter_dft(self):
+        visits = []
+        traversal = self.graph.iter_dft(1, on_visit=lambda v, depth: visits.append(v))
+        self.assertEqual(next(traversal), 1)
+        self.assertEqual(next(traversal), 2)
+        self.assertEqual(visits, [1, 2])
+        self.assertEqual(set(self.graph.iter_dft(1, max_depth=2)), {1, 2, 3, 4})
+
     def test_bfs(self):
         bfs = [1, 2, 4, 6]
         self.assertListEqual(self.graph.bfs(1, 6), bfs)
 
+    def test_bidirectional_bfs(self):
+        self.assertEqual(set(self.graph.get_predecessors(3)), {2, 5, 6})
+        self.assertListEqual(self.graph.bidirectional_bfs(1, 6), [1, 2, 4, 6])
+        self.assertListEqual(self.graph.bidirectional_bfs(3, 3), [3])
+        self.assertIsNone(self.graph.bidirectional_bfs(5, 1))
+
+    def test_multi_source_bfs(self):
+        distances, nearest = self.graph.multi_source_bfs([5, 4])
+        self.assertEqual(distances, {5: 0, 4: 0, 3: 1, 6: 1, 7: 1, 1: 2, 2: 3})
+        self.assertEqual(nearest, {5: 5, 4: 4, 3: 5, 6: 4, 7: 4, 1: 4, 2: 4})
+
+    def test_component_index(self):
+        components = self.graph.strongly_connected_components()
+        self.assertEqual(sorted(map(sorted, components)), [[1, 2, 4, 7], [3, 5], [6]])
+        # components come after the ones they point into
+        self.assertEqual(sorted(components[0]), [3, 5])
+
+        index = self.graph.component_index()
+        self.assertTrue(index.same_component(1, 7))
+        self.assertFalse(index.same_component(1, 6))
+        self.assertEqual(index.size_of(4), 4)
+        self.assertEqual(sorted(index.sizes()), [1, 2, 4])
+
+    def test_connectivity(self):
+        graph = Graph()
+        for v in range(5):
+            graph.add_vertex(v)
+        dropped = []
+        graph.add_cache_listener(dropped.append)
+
+        graph.add_edge(0, 1)
+        graph.add_edges_from([(3, 2), (2, 3)])
+        self.assertTrue(graph.weakly_connected(1, 0))
+        self.assertFalse(graph.weakly_connected(1, 2))
+        self.assertEqual(graph.component_size(3), 2)
+        self.assertEqual(len(dropped), 2)
+
+        graph.add_edge(1, 2)
+        self.assertEqual(graph.component_size(0), 4)
+
+        # re-adding a vertex drops its edges
+        graph.add_vertex(1)
+        self.assertFalse(graph.weakly_connected(0, 2))
+
+    def test_weakly_connected(self):
+        self.assertTrue(self.graph.weakly_connected(1, 5))
+        self.assertEqual(self.graph.component_size(1), 7)
+
     def test_dfs(self):
         dfs = [
             [1, 2, 4, 6],
@@ -115,5 +226,89 @@ class Test(unittest.TestCase):
         ]
         self.assertIn(self.graph.dfs_recursive(1,6), dfs)
 
+    def test_deep_chain(self):
+        graph = Graph()
+        for i in range(sys.getrecursionlimit() * 5):
+            graph.add_vertex(i)
+            if i > 0:
+                graph.add_edge(i - 1, i)
+        last = len(graph.vertices) - 1
+
+        stdout_ = sys.stdout
+        sys.stdout = io.StringIO()
+        graph.dft_recursive(0)
+        output = sys.stdout.getvalue()
+        sys.stdout = stdout_  # Restore stdout
+
+        self.assertEqual(output.split(), [str(i) for i in range(last + 1)])
+        self.assertListEqual(graph.dfs_recursive(0, last), list(range(last + 1)))
+
+    def test_bfs_tree(self):
+        parents = self.graph.bfs_tree(1)
+        self.assertEqual(set(parents), {1, 2, 3, 4, 5, 6, 7})
+        self.assertIsNone(parents[1])
+        self.assertListEqual(reconstruct_path(parents, 6), [1, 2, 4, 6])
+        self.assertIsNone(reconstruct_path(self.graph.bfs_tree(5), 1))
+
+    def test_dfs_tree(self):
+        parents = self.graph.dfs_tree(1)
+        self.assertEqual(set(parents), {1, 2, 3, 4, 5, 6, 7})
+        self.assertIn(reconstruct_path(parents, 6), [[1, 2, 4, 6], [1, 2, 4, 7, 6]])
+
+class CSRTest(Test):
+    def setUp(self):
+        super().setUp()
+        self.graph = self.graph.freeze()
+
+    def test_frozen(self):
+        self.assertIsInstance(self.graph, CSRGraph)
+        self.assertEqual(self.graph.num_edges(), 10)
+        with self.assertRaises(TypeError):
+            self.graph.add_vertex(8)
+        with self.assertRaises(TypeError):
+            self.graph.add_edge(1, 5)
+        with self.assertRaises(TypeError):
+            self.graph.add_edges_from([(1, 5)])
+
+    def test_multi_source_distances(self):
+        distances, nearest = self.graph.multi_source_distances([5, 4])
+        index = self.graph.index
+        labels = self.graph.labels
+        expected, expected_nearest = Graph.multi_source_bfs(self.graph, [5, 4])
+        for v in labels:
+            self.assertEqual(distances[index[v]], expected[v])
+            self.assertEqual(labels[nearest[index[v]]], expected_nearest[v])
+
+    @unittest.skipUnless(np, "needs NumPy")
+    def test_multi_source_distances_numpy(self):
+        rng = np.random.default_rng(0)
+        graphs = [self.graph,
+                  CSRGraph.from_numpy(rng.integers(0, 300, 600), rng.integers(0, 300, 600))]
+        for graph in graphs:
+            for sources in ([graph.labels[0]], graph.labels[:5:2], graph.labels[-3:] + graph.labels[:1]):
+                distances, nearest = graph.multi_source_distances(sources)
+                np_distances, np_nearest = graph.multi_source_distances(sources, use_numpy=True)
+                self.assertEqual(np_distances.tolist(), distances.tolist())
+                self.assertEqual(np_nearest.tolist(), nearest.tolist())
+
+class QueueTest(unittest.TestCase):
+    def test_queue(self):
+        q = Queue(capacity=3)
+        q.enqueue_many([1, 2])
+        q.enqueue(3)
+        self.assertEqual(len(q), 3)
+        with self.assertRaises(IndexError):
+            q.enqueue(4)
+        self.assertEqual([q.dequeue(), q.dequeue(), q.dequeue()], [1, 2, 3])
+        self.assertIsNone(q.dequeue())
+
+    def test_stack(self):
+        s = Stack(capacity=2)
+        s.push_many([1, 2])
+        with self.assertRaises(IndexError):
+            s.push(3)
+        self.assertEqual([s.pop(), s.pop(), s.pop()], [2, 1, None])
+        self.assertEqual(len(s), 0)
+
 if __name__ == '__main__':
     unittest.main()
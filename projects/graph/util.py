@@ -1,23 +1,49 @@
+from collections import deque
 
-# Note: This Queue class is sub-optimal. Why?
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the from_numpy loaders need it
+    np = None
+
+# deque gives O(1) appends and pops at both ends, unlike list.pop(0)
 class Queue():
-    def __init__(self):
-        self.queue = []
+    def __init__(self, capacity=None):
+        self.queue = deque()
+        self.capacity = capacity  # None means unbounded
     def enqueue(self, value):
+        if self.capacity is not None and len(self.queue) >= self.capacity:
+            raise IndexError("Cannot enqueue onto a full Queue!")
         self.queue.append(value)
+    def enqueue_many(self, values):
+        if self.capacity is None:
+            self.queue.extend(values)
+        else:
+            for value in values:
+                self.enqueue(value)
     def dequeue(self):
         if self.size() > 0:
-            return self.queue.pop(0)
+            return self.queue.popleft()
         else:
             return None
     def size(self):
         return len(self.queue)
+    def __len__(self):
+        return len(self.queue)
 
 class Stack():
-    def __init__(self):
+    def __init__(self, capacity=None):
         self.stack = []
+        self.capacity = capacity  # None means unbounded
     def push(self, value):
+        if self.capacity is not None and len(self.stack) >= self.capacity:
+            raise IndexError("Cannot push onto a full Stack!")
         self.stack.append(value)
+    def push_many(self, values):
+        if self.capacity is None:
+            self.stack.extend(values)
+        else:
+            for value in values:
+                self.push(value)
     def pop(self):
         if self.size() > 0:
             return self.stack.pop()
@@ -25,4 +51,219 @@ class Stack():
             return None
     def size(self):
         return len(self.stack)
+    def __len__(self):
+        return len(self.stack)
+
+def reconstruct_path(parents, destination):
+    """
+    Walk a predecessor map back from destination.
+
+    parents maps each vertex to the vertex it was discovered from, with the
+    search root mapped to None. Returns the path from the root to
+    destination, or None if destination was never reached.
+    """
+    if destination not in parents:
+        return None
+
+    path = []
+    v = destination
+    while v is not None:
+        path.append(v)
+        v = parents[v]
+
+    path.reverse()
+    return path
+
+# marks a bidirectional search level that did not meet the other side
+_NOT_MET = object()
+
+def _expand_level(frontier, parents, other_parents, get_neighbors):
+    """
+    Expand one whole breadth-first level of a bidirectional search.
+
+    Returns the next frontier and the first vertex also reached by the
+    other side, or _NOT_MET if the two searches did not touch.
+    """
+    next_frontier = []
+    for v in frontier:
+        for edge in get_neighbors(v):
+            if edge not in parents:
+                parents[edge] = v
+                if edge in other_parents:
+                    return next_frontier, edge
+                next_frontier.append(edge)
+    return next_frontier, _NOT_MET
+
+def bidirectional_search(start, destination, get_neighbors, get_predecessors):
+    """
+    Shortest path from start to destination by breadth-first search
+    from both ends, always growing the smaller frontier by a full level.
+
+    get_neighbors(v) follows edges forward and get_predecessors(v)
+    follows them backward (pass get_neighbors twice for undirected
+    graphs). Returns None if destination cannot be reached.
+    """
+    if start == destination:
+        return [start]
+
+    forward = {start: None}
+    backward = {destination: None}
+    forward_frontier = [start]
+    backward_frontier = [destination]
+
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meet = _expand_level(forward_frontier, forward, backward, get_neighbors)
+        else:
+            backward_frontier, meet = _expand_level(backward_frontier, backward, forward, get_predecessors)
+
+        # levels are expanded whole, so the first meeting is a shortest path
+        if meet is not _NOT_MET:
+            path = reconstruct_path(forward, meet)
+            tail = reconstruct_path(backward, meet)
+            tail.reverse()
+            return path + tail[1:]
+
+    return None
+
+def multi_source_bfs(sources, get_neighbors):
+    """
+    Level-synchronous breadth-first search from many sources at once.
+
+    Returns two dictionaries keyed by every reached vertex: its hop
+    distance to the nearest source, and which source that is. Ties go
+    to the source listed first, since each level's frontier is expanded
+    in source order.
+    """
+    distances = {}
+    nearest = {}
+    frontier = []
+    for source in sources:
+        if source not in distances:
+            distances[source] = 0
+            nearest[source] = source
+            frontier.append(source)
+
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for v in frontier:
+            for edge in get_neighbors(v):
+                if edge not in distances:
+                    distances[edge] = depth
+                    nearest[edge] = nearest[v]
+                    next_frontier.append(edge)
+        frontier = next_frontier
+
+    return distances, nearest
+
+def unique_edges_numpy(src, dst):
+    """
+    Deduplicate parallel NumPy arrays of edge endpoints.
+
+    Returns (labels, sources, targets): the sorted array of distinct
+    vertex labels, plus the index of each distinct edge's endpoints in
+    labels, sorted by source and then target.
+    """
+    if np is None:
+        raise ImportError("Loading edges from NumPy arrays requires NumPy")
+
+    src = np.asarray(src)
+    dst = np.asarray(dst)
+    if src.shape != dst.shape:
+        raise ValueError("src and dst must have the same length")
+
+    labels, inverse = np.unique(np.concatenate([src, dst]), return_inverse=True)
+    num_vertices = len(labels)
+
+    # one integer key per edge, so a single unique() sorts and dedupes
+    keys = np.unique(inverse[:len(src)].astype(np.int64) * num_vertices + inverse[len(src):])
+    return labels, keys // num_vertices, keys % num_vertices
+
+def gather_rows_numpy(offsets, targets, rows):
+    """
+    Concatenate the CSR slices targets[offsets[i]:offsets[i + 1]] for
+    every i in rows with vectorized NumPy operations.
+
+    Returns (gathered, counts), counts holding each row's slice length,
+    e.g. for np.repeat-ing per-row values alongside the gathered ones.
+    """
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    total = int(counts.sum())
+    # shift each output position back to its row's slice in targets
+    shifts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return targets[np.arange(total) + shifts], counts
+
+class DisjointSet():
+    """
+    Union-find with union by size and path halving, so find and union
+    run in near-constant (inverse Ackermann) amortized time.
+    """
+    def __init__(self, items=()):
+        self.parent = {}
+        self.sizes = {}  # root -> number of items in its set
+        for item in items:
+            self.add(item)
+    def add(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.sizes[item] = 1
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]  # halve the path
+            item = parent[item]
+        return item
+    def union(self, a, b):
+        """
+        Merge the sets holding a and b. Returns True if they were separate.
+        """
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.sizes[a] < self.sizes[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.sizes[a] += self.sizes.pop(b)
+        return True
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+    def set_size(self, item):
+        return self.sizes[self.find(item)]
+    def groups(self):
+        """
+        List of sets as lists of items.
+        """
+        groups = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
+    def __len__(self):
+        return len(self.sizes)  # number of disjoint sets
 
+class ComponentIndex():
+    """
+    Component-ID lookup built from a list of components (lists of
+    vertices), numbered in the order given.
+    """
+    def __init__(self, components):
+        self.components = [list(component) for component in components]
+        self.component_ids = {}
+        for component_id, component in enumerate(self.components):
+            for vertex in component:
+                self.component_ids[vertex] = component_id
+    def component_of(self, vertex):
+        return self.component_ids[vertex]
+    def same_component(self, a, b):
+        return self.component_ids[a] == self.component_ids[b]
+    def size_of(self, vertex):
+        return len(self.components[self.component_ids[vertex]])
+    def sizes(self):
+        """
+        Component sizes, indexed by component ID.
+        """
+        return [len(component) for component in self.components]
+    def __len__(self):
+        return len(self.components)
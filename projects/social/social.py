@@ -1,8 +1,64 @@
 import sys
 import random, math
+from array import array
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only from_numpy uses it
+    np = None
 
 sys.path.append('../graph')
-from util import Queue
+from util import (Queue, bidirectional_search, multi_source_bfs,
+                  DisjointSet, ComponentIndex)
+import sparse_engine
+
+def _owned_pairs(lo, hi, num_users):
+    """
+    Number of pairs (user_id, friend_id) with lo <= user_id < hi
+    and user_id < friend_id <= num_users
+    """
+    rows = hi - lo
+    first = num_users - lo  # pairs owned by user lo
+    return rows * first - rows * (rows - 1) // 2
+
+
+def _decode_pair(k, lo, num_users):
+    """
+    Turns the k-th pair owned by a chunk starting at user lo into
+    (user_id, friend_id), counting row by row
+    """
+    first = num_users - lo
+    b = 2 * first + 1
+    # invert the row offsets r * first - r * (r - 1) / 2 <= k
+    r = (b - math.isqrt(b * b - 8 * k)) // 2
+    while _owned_pairs(lo, lo + r + 1, num_users) <= k:
+        r += 1
+    while r > 0 and _owned_pairs(lo, lo + r, num_users) > k:
+        r -= 1
+    user_id = lo + r
+    return user_id, user_id + 1 + k - _owned_pairs(lo, user_id, num_users)
+
+
+def _generate_chunk(task):
+    """
+    Worker for populate_graph_parallel: draws one chunk's friendships
+
+    Depends only on the task, never on which process runs it.
+    Returns (user_ids, friend_ids) arrays.
+    """
+    seed, chunk_index, lo, hi, num_users, quota = task
+    rng = random.Random(f"{seed}:{chunk_index}")
+
+    typecode = 'i' if num_users < 2 ** 31 else 'q'
+    user_ids = array(typecode)
+    friend_ids = array(typecode)
+    for k in rng.sample(range(_owned_pairs(lo, hi, num_users)), quota):
+        user_id, friend_id = _decode_pair(k, lo, num_users)
+        user_ids.append(user_id)
+        friend_ids.append(friend_id)
+    return user_ids, friend_ids
+
 
 class User:
     def __init__(self, name):
@@ -14,19 +70,147 @@ class SocialGraph:
         self.users = {}
         self.friendships = {}
         self.friendships_counter = 0
+        self.sparse_adjacency = None  # cached (matrix, user_ids, index) for the sparse engine
+        self.component_cache = None  # cached ComponentIndex of friend networks
+        self.networks = DisjointSet()  # friend networks, kept up to date on insert
+        self.cache_listeners = []  # called with the graph whenever it changes
+
+    def add_cache_listener(self, callback):
+        """
+        Registers callback(social_graph) to run whenever users or
+        friendships are added, so caches derived from them can be dropped
+        """
+        self.cache_listeners.append(callback)
+
+    def invalidate_caches(self):
+        """
+        Drops everything derived from the friendships; called
+        whenever users or friendships are added
+        """
+        self.sparse_adjacency = None
+        self.component_cache = None
+        for callback in self.cache_listeners:
+            callback(self)
+
+    def reset(self):
+        """
+        Removes every user and friendship
+        """
+        self.last_id = 0
+        self.users = {}
+        self.friendships = {}
+        self.friendships_counter = 0
+        self.networks = DisjointSet()
+        self.invalidate_caches()
 
     def add_friendship(self, user_id, friend_id):
         """
         Creates a bi-directional friendship
+
+        Returns True if it was created, False otherwise
         """
         if user_id == friend_id:
             print("WARNING: You cannot be friends with yourself")
+            return False
         elif friend_id in self.friendships[user_id] or user_id in self.friendships[friend_id]:
             print("WARNING: Friendship already exists")
+            return False
         else:
             self.friendships[user_id].add(friend_id)
             self.friendships[friend_id].add(user_id)
             self.friendships_counter += 1
+            if self.networks is not None:
+                self.networks.union(user_id, friend_id)
+            self.invalidate_caches()
+            return True
+
+    def add_friendships_from(self, friendships):
+        """
+        Creates many bi-directional friendships in one pass
+
+        Self-friendships and friendships that already exist are skipped
+        without printing a warning. An unknown user raises IndexError,
+        keeping the friendships added before it. Returns the number of
+        new friendships.
+        """
+        adjacency = self.friendships
+        networks = self.networks
+        added = 0
+
+        try:
+            for user_id, friend_id in friendships:
+                if user_id == friend_id:
+                    continue
+                if user_id not in adjacency or friend_id not in adjacency:
+                    raise IndexError("Cannot add a friendship with a user that does not exist!")
+
+                friends = adjacency[user_id]
+                if friend_id not in friends:
+                    friends.add(friend_id)
+                    adjacency[friend_id].add(user_id)
+                    if networks is not None:
+                        networks.union(user_id, friend_id)
+                    added += 1
+        finally:
+            # friendships before a failing one stay added, so count them either way
+            self.friendships_counter += added
+            self.invalidate_caches()
+        return added
+
+    @classmethod
+    def from_edge_list(cls, friendships, num_users=None):
+        """
+        Builds a social graph from an iterable of (user_id, friend_id)
+        pairs, with users 1..num_users (defaults to the highest ID seen)
+        """
+        friendships = list(friendships)
+        if num_users is None:
+            num_users = max((max(pair) for pair in friendships), default=0)
+
+        sg = cls()
+        for i in range(num_users):
+            sg.add_user(f"User {i + 1}")
+        sg.add_friendships_from(friendships)
+        return sg
+
+    @classmethod
+    def from_numpy(cls, src, dst, num_users=None):
+        """
+        Builds a social graph from parallel NumPy arrays of user IDs,
+        deduplicating and grouping the friendships with NumPy
+        """
+        if np is None:
+            raise ImportError("SocialGraph.from_numpy requires NumPy")
+
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if num_users is None:
+            num_users = int(max(src.max(initial=0), dst.max(initial=0)))
+        if src.size and (min(src.min(), dst.min()) < 1 or max(src.max(), dst.max()) > num_users):
+            raise IndexError("Cannot add a friendship with a user that does not exist!")
+
+        # one key per unordered pair, skipping self-friendships
+        keep = src != dst
+        low = np.minimum(src[keep], dst[keep])
+        high = np.maximum(src[keep], dst[keep])
+        keys = np.unique(low * (num_users + 1) + high)
+        low, high = keys // (num_users + 1), keys % (num_users + 1)
+
+        # both directions, grouped by user
+        users = np.concatenate([low, high])
+        friends = np.concatenate([high, low])
+        order = np.argsort(users, kind='stable')
+        bounds = np.searchsorted(users[order], np.arange(1, num_users + 2)).tolist()
+        friends = friends[order].tolist()
+
+        sg = cls()
+        for i in range(num_users):
+            sg.add_user(f"User {i + 1}")
+        for user_id in range(1, num_users + 1):
+            sg.friendships[user_id] = set(friends[bounds[user_id - 1]:bounds[user_id]])
+        sg.friendships_counter = len(keys)
+        sg.networks = None  # built on first use
+        return sg
 
     def add_user(self, name):
         """
@@ -35,6 +219,9 @@ class SocialGraph:
         self.last_id += 1  # automatically increment the ID to assign the new user
         self.users[self.last_id] = User(name)
         self.friendships[self.last_id] = set()
+        if self.networks is not None:
+            self.networks.add(self.last_id)
+        self.invalidate_caches()
 
     def populate_graph(self, num_users, avg_friendships):
         """
@@ -45,114 +232,305 @@ class SocialGraph:
         between those users.
 
         The number of users must be greater than the average number of friendships.
+
+        Returns the number of random pairs rejected as collisions
+        (see populate_graph_linear)
         """
-       # Reset graph
-        self.last_id = 0
-        self.users = {}
-        self.friendships = {}
+        return self.populate_graph_linear(num_users, avg_friendships)
 
-        # Add users
-        for i in range(num_users):
-            self.add_user(f"User {i}")
-        
-        # all possible friendship combos
-        possible_friendships = []
-
-        # check that last number is larger than 1st number to avoid duplicates
-        for user_id in self.users:
-            for friend_id in range(user_id + 1, self.last_id + 1):
-                possible_friendships.append((user_id, friend_id))
-        
-        # Shuffle the possible friendships
-        random.shuffle(possible_friendships)
-
-        # Add friendships
-        # we need to divide by 2 since each add_friendship() creates 2 friendships
-        for i in range(num_users * avg_friendships // 2):
-            friendship = possible_friendships[i]
-            self.add_friendship(friendship[0], friendship[1])
-    
     def populate_graph_linear(self, num_users, avg_friendships):
         """
         Stretch: refactor populate_graph to run in O(n) time
+
+        Draws random pairs and rejects self-friendships and repeats,
+        instead of listing and shuffling every possible pair, so it
+        creates exactly num_users * avg_friendships // 2 friendships in
+        expected O(num_users * avg_friendships) time and memory.
+
+        Returns the number of rejected pairs (collisions)
         """
         # Reset graph
-        self.last_id = 0
-        self.users = {}
-        self.friendships = {}
-       
+        self.reset()
+
         # add users
         for i in range(num_users):
-            self.add_user(f"User {i+1}")  
+            self.add_user(f"User {i+1}")
 
-        # get target number of friendships
-        target_friendships = (num_users * avg_friendships)
+        # we need to divide by 2 since each friendship is stored twice
+        target_friendships = num_users * avg_friendships // 2
+        possible_friendships = num_users * (num_users - 1) // 2
+        if target_friendships > possible_friendships:
+            raise ValueError("The number of users must be greater than the average number of friendships")
 
-        # set counters for friendships and collisions
+        # past half of all possible pairs, rejection sampling slows down,
+        # so sample the pairs to leave out instead
+        if target_friendships > possible_friendships // 2:
+            return self._populate_dense(num_users, possible_friendships - target_friendships)
+
+        friendships = self.friendships
+        randrange = random.randrange
         total_friendships = 0
         collisions = 0
 
-        # while total friendhips < target
         while total_friendships < target_friendships:
-            # set user id and friend id to a random int between 1 and number of users
-            user_id = random.randint(1, num_users)
-            friend_id = random.randint(1, num_users)
-
-            # if return of add friendship for user and friend ids = true,
-            if self.add_friendship(user_id, friend_id):
-                # increment friendship counter
-                total_friendships += 2
-            # otherwise increment collision counter
+            # random pair of distinct user IDs between 1 and num_users
+            user_id = randrange(num_users) + 1
+            friend_id = randrange(num_users - 1) + 1
+            if friend_id >= user_id:
+                friend_id += 1
+
+            # the friendship sets double as the hash set of chosen pairs
+            if friend_id in friendships[user_id]:
+                collisions += 1
             else:
+                friendships[user_id].add(friend_id)
+                friendships[friend_id].add(user_id)
+                total_friendships += 1
+
+        self.friendships_counter = total_friendships
+        self.networks = None  # built on first use
+        self.invalidate_caches()
+        return collisions
+
+    def _populate_dense(self, num_users, num_missing):
+        """
+        Befriends every pair of users except num_missing random ones,
+        for targets above half of all possible friendships
+        """
+        randrange = random.randrange
+        missing = set()
+        collisions = 0
+
+        # rejection-sample the pairs to skip, stored as (low, high)
+        while len(missing) < num_missing:
+            user_id = randrange(num_users) + 1
+            friend_id = randrange(num_users - 1) + 1
+            if friend_id >= user_id:
+                friend_id += 1
+            pair = (min(user_id, friend_id), max(user_id, friend_id))
+            if pair in missing:
                 collisions += 1
-        # print("Total Frienships: {total_friendships} \nTotal Collisions: {collisions}")
+            else:
+                missing.add(pair)
+
+        self.add_friendships_from((user_id, friend_id)
+                                  for user_id in range(1, num_users + 1)
+                                  for friend_id in range(user_id + 1, num_users + 1)
+                                  if (user_id, friend_id) not in missing)
+        return collisions
+
+    def populate_graph_parallel(self, num_users, avg_friendships, seed, workers=None,
+                                chunk_size=100000):
+        """
+        Seeded, multi-process version of populate_graph
 
+        The user IDs are split into chunks of chunk_size. Each chunk owns
+        the pairs whose lower ID falls inside it and gets a share of the
+        friendships proportional to how many pairs it owns. Every chunk
+        is drawn from its own Random(seed, chunk) by a process pool and
+        merged in chunk order, so the same seed and chunk_size give the
+        same graph for any number of workers.
 
-    def get_all_social_paths(self, user_id):
+        workers defaults to the CPU count; workers=1 runs in-process.
+        """
+        # Reset graph
+        self.reset()
+
+        # add users
+        for i in range(num_users):
+            self.add_user(f"User {i+1}")
+
+        target_friendships = num_users * avg_friendships // 2
+        possible_friendships = num_users * (num_users - 1) // 2
+        if target_friendships > possible_friendships:
+            raise ValueError("The number of users must be greater than the average number of friendships")
+
+        # split the target across chunks by largest remainder,
+        # using integer maths only so every run agrees
+        bounds = [(lo, min(lo + chunk_size, num_users + 1))
+                  for lo in range(1, num_users + 1, chunk_size)]
+        shares = [divmod(target_friendships * _owned_pairs(lo, hi, num_users), max(possible_friendships, 1))
+                  for lo, hi in bounds]
+        quotas = [quota for quota, _ in shares]
+        leftover = target_friendships - sum(quotas)
+        for i in sorted(range(len(shares)), key=lambda i: (-shares[i][1], i))[:leftover]:
+            quotas[i] += 1
+
+        tasks = [(seed, i, lo, hi, num_users, quotas[i]) for i, (lo, hi) in enumerate(bounds)]
+
+        if workers == 1:
+            self._merge_chunks(map(_generate_chunk, tasks))
+        else:
+            with Pool(workers) as pool:
+                self._merge_chunks(pool.imap(_generate_chunk, tasks))
+
+        self.friendships_counter = target_friendships
+
+    def _merge_chunks(self, chunks):
+        """
+        Adds generated (user_ids, friend_ids) chunks, in order
+        """
+        friendships = self.friendships
+        for user_ids, friend_ids in chunks:
+            for user_id, friend_id in zip(user_ids, friend_ids):
+                friendships[user_id].add(friend_id)
+                friendships[friend_id].add(user_id)
+        self.networks = None  # built on first use
+        self.invalidate_caches()
+
+    def get_networks(self):
+        """
+        Returns the DisjointSet of friend networks. It is updated on
+        every add_user / add_friendship, so queries stay O(α(n)) while
+        the graph grows; bulk generators leave it to be rebuilt here
+        """
+        if self.networks is None:
+            networks = DisjointSet(self.friendships)
+            for user_id, friends in self.friendships.items():
+                for friend_id in friends:
+                    if user_id < friend_id:  # each friendship is stored twice
+                        networks.union(user_id, friend_id)
+            self.networks = networks
+        return self.networks
+
+    def connected_components(self):
+        """
+        Returns every friend network (connected component) as a list
+        of user IDs
+        """
+        return self.get_networks().groups()
+
+    def component_index(self):
+        """
+        Returns a ComponentIndex of the friend networks, computed
+        once and reused until the graph changes
+        """
+        if self.component_cache is None:
+            self.component_cache = ComponentIndex(self.connected_components())
+        return self.component_cache
+
+    def in_same_network(self, user_id, friend_id):
+        """
+        O(α(n)) check whether friend_id is in user_id's extended network
+        """
+        return self.get_networks().connected(user_id, friend_id)
+
+    def network_size(self, user_id):
+        """
+        Number of users in user_id's extended network, including user_id
+        """
+        return self.get_networks().set_size(user_id)
+
+    def get_sparse_adjacency(self):
+        """
+        Returns the friendships as a (scipy CSR matrix, user_ids, index)
+        triple, exported once and reused until the graph changes
+        """
+        if self.sparse_adjacency is None:
+            self.sparse_adjacency = sparse_engine.to_adjacency(self.friendships)
+        return self.sparse_adjacency
+
+    def get_social_tree(self, user_id, engine='python'):
         """
         Takes a user's user_id as an argument
 
-        Returns a dictionary containing every user in that user's
-        extended network with the shortest friendship path between them.
+        Returns a dictionary mapping every user in that user's
+        extended network to the friend they were reached through
+        on a shortest friendship path (user_id maps to None).
 
-        The key is the friend's ID and the value is the path.
+        Use reconstruct_path() to pull individual paths out of it.
 
-        BFS for shotest path
+        engine='sparse' runs the BFS over a sparse adjacency matrix,
+        falling back to the pure Python BFS without NumPy and SciPy
         """
-        visited = {}  # Note that this is a dictionary, not a set
-        
         # if no user ID found
         if user_id not in self.users:
             print('WARNING: User id does not exist')
             return
-        
-        # instantiate queue and enqueue new user id as a list
+
+        if engine == 'sparse' and sparse_engine.AVAILABLE:
+            adjacency, user_ids, index = self.get_sparse_adjacency()
+            return sparse_engine.social_tree(adjacency, user_ids, index, user_id)
+
+        # instantiate queue and enqueue the starting user
         q = Queue()
-        q.enqueue([user_id])
+        q.enqueue(user_id)
+
+        # predecessor map, doubles as the visited set
+        parents = {user_id: None}
 
         # iterate thru friends/neighbors breadth-first
-        # while queue is not empty
         while q.size() > 0:
-            
-            # deueue to path variable
-            path = q.dequeue()
+            user = q.dequeue()
 
-            # set user as last item in the path
-            user = path[-1]
+            for friend in self.friendships[user]:
+                # if neighbor not yet reached, remember who we reached it from
+                if friend not in parents:
+                    parents[friend] = user
+                    q.enqueue(friend)
 
-            # if user is not in visited
-            if user not in visited:
-                # set user path in visited
-                visited[user] = path
+        return parents
 
-            for friend in self.friendships[user]:
-                # if neighbor not in visited
-                if friend not in visited:
-                    # add friend to queue and update path
-                    q.enqueue(path + [friend])
+    def get_social_path(self, user_id, friend_id):
+        """
+        Takes two user IDs as arguments
 
-        return visited
+        Returns the shortest friendship path between them, or None
+        if friend_id is outside user_id's extended network.
+
+        Bidirectional BFS, meeting in the middle
+        """
+        if user_id not in self.users or friend_id not in self.users:
+            print('WARNING: User id does not exist')
+            return
+
+        # friendships are bi-directional, so both searches follow the same edges
+        neighbors = self.friendships.__getitem__
+        return bidirectional_search(user_id, friend_id, neighbors, neighbors)
+
+    def get_network_distances(self, user_ids):
+        """
+        Takes a list of user IDs as an argument
+
+        Returns (distances, nearest) dictionaries covering every user in
+        the combined extended network: the number of friendship hops to
+        the closest of user_ids, and which of user_ids that is.
+
+        One level-synchronous BFS for all of them
+        """
+        missing = [user_id for user_id in user_ids if user_id not in self.users]
+        if missing:
+            print('WARNING: User id does not exist')
+            return
 
+        return multi_source_bfs(user_ids, self.friendships.__getitem__)
+
+    def get_all_social_paths(self, user_id, engine='python'):
+        """
+        Takes a user's user_id as an argument
+
+        Returns a dictionary containing every user in that user's
+        extended network with the shortest friendship path between them.
+
+        The key is the friend's ID and the value is the path.
+
+        BFS for shotest path, see get_social_tree for engine
+        """
+        parents = self.get_social_tree(user_id, engine)
+        if parents is None:
+            return
+
+        visited = {}  # Note that this is a dictionary, not a set
+
+        # parents are listed in discovery order, so every parent's path
+        # is built before any of its children need it
+        for user, parent in parents.items():
+            if parent is None:
+                visited[user] = [user]
+            else:
+                visited[user] = visited[parent] + [user]
+
+        return visited
 
 if __name__ == '__main__':
     print('Social graph of 10 users with 2 friends on average:\n')
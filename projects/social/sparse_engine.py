@@ -0,0 +1,104 @@
+"""
+Sparse-matrix breadth-first search over SocialGraph friendships
+
+The friendships are exported once to a SciPy CSR adjacency matrix. Each
+BFS level then gathers the frontier's rows straight from its indptr /
+indices arrays with vectorized NumPy operations, and the parents are
+derived for every user in one pass after the search. Needs NumPy and
+SciPy; check AVAILABLE before calling anything else here.
+"""
+import sys
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # fall back to the pure Python BFS in social.py
+    np = None
+    sparse = None
+
+sys.path.append('../graph')
+from util import gather_rows_numpy
+
+AVAILABLE = sparse is not None
+
+
+def to_adjacency(friendships):
+    """
+    Export a friendships dictionary of sets to a CSR adjacency matrix.
+
+    Returns (matrix, user_ids, index) where row/column i of the matrix
+    belongs to user_ids[i] and index maps user IDs back to rows.
+    """
+    user_ids = list(friendships)
+    index = {user_id: i for i, user_id in enumerate(user_ids)}
+
+    degrees = np.fromiter((len(friendships[user_id]) for user_id in user_ids),
+                          dtype=np.int64, count=len(user_ids))
+    indptr = np.zeros(len(user_ids) + 1, dtype=np.int64)
+    np.cumsum(degrees, out=indptr[1:])
+
+    indices = np.fromiter((index[friend] for user_id in user_ids for friend in friendships[user_id]),
+                          dtype=np.int64, count=int(indptr[-1]))
+    data = np.ones(len(indices), dtype=np.int32)
+
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(user_ids), len(user_ids)))
+    return matrix, user_ids, index
+
+
+def sparse_bfs(adjacency, source):
+    """
+    Breadth-first search from row index source of a symmetric adjacency
+    matrix.
+
+    Returns (distances, parents) arrays: hop distance from source and the
+    row index each user was reached from, -1 where unreached (and as the
+    parent of source itself).
+    """
+    num_users = adjacency.shape[0]
+    indptr = adjacency.indptr.astype(np.int64)
+    indices = adjacency.indices.astype(np.int64)
+
+    distances = np.full(num_users, -1, dtype=np.int64)
+    distances[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+
+    depth = 0
+    while frontier.size:
+        depth += 1
+
+        # gather every frontier user's row of friends in one go
+        friends, _ = gather_rows_numpy(indptr, indices, frontier)
+        if friends.size == 0:
+            break
+
+        # friends not seen before make up the next level
+        frontier = np.unique(friends[distances[friends] < 0])
+        distances[frontier] = depth
+
+    # parent = lowest-index friend one level closer to source
+    rows = np.repeat(np.arange(num_users), np.diff(indptr))
+    closer = (distances[rows] > 0) & (distances[indices] == distances[rows] - 1)
+    parents = np.full(num_users, num_users, dtype=np.int64)
+    np.minimum.at(parents, rows[closer], indices[closer])
+    parents[parents == num_users] = -1
+
+    return distances, parents
+
+
+def social_tree(adjacency, user_ids, index, user_id):
+    """
+    Sparse equivalent of SocialGraph.get_social_tree, keyed by user ID.
+
+    Users are listed in order of distance, so every user's parent comes
+    before them.
+    """
+    distances, parents = sparse_bfs(adjacency, index[user_id])
+
+    reached = np.flatnonzero(distances >= 0)
+    reached = reached[np.argsort(distances[reached], kind='stable')]
+
+    tree = {}
+    for i in reached.tolist():
+        parent = parents[i]
+        tree[user_ids[i]] = None if parent < 0 else user_ids[parent]
+    return tree
@@ -0,0 +1,284 @@
+import unittest
+import random
+import io
+from contextlib import redirect_stdout
+
+from social import SocialGraph, _owned_pairs, _decode_pair, np
+import sparse_engine
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(0)
+        self.graph = SocialGraph()
+        self.graph.populate_graph(200, 3)
+
+    def check_friendships(self, graph, num_users, num_friendships):
+        self.assertEqual(set(graph.friendships), set(range(1, num_users + 1)))
+        total = 0
+        for user_id, friends in graph.friendships.items():
+            self.assertNotIn(user_id, friends)
+            for friend_id in friends:
+                self.assertIn(user_id, graph.friendships[friend_id])
+            total += len(friends)
+        self.assertEqual(total, 2 * num_friendships)
+        self.assertEqual(graph.friendships_counter, num_friendships)
+
+    def check_networks(self, graph):
+        # the DisjointSet networks agree with a BFS from every user
+        expected = {frozenset(graph.get_social_tree(user_id)) for user_id in graph.users}
+        self.assertEqual({frozenset(network) for network in graph.connected_components()}, expected)
+        for user_id in graph.users:
+            self.assertEqual(graph.network_size(user_id), len(graph.get_social_tree(user_id)))
+
+    def test_populate_graph_linear(self):
+        self.check_friendships(self.graph, 200, 300)
+        graph = SocialGraph()
+        graph.populate_graph_linear(50, 7)
+        self.check_friendships(graph, 50, 175)
+        with self.assertRaises(ValueError):
+            graph.populate_graph_linear(5, 5)
+
+    def test_populate_dense(self):
+        # 7 and 10 of the 10 possible friendships are past half,
+        # so _populate_dense leaves pairs out instead
+        graph = SocialGraph()
+        graph.populate_graph_linear(5, 3)
+        self.check_friendships(graph, 5, 7)
+        graph.populate_graph_linear(5, 4)
+        self.check_friendships(graph, 5, 10)
+
+    def test_decode_pair(self):
+        for num_users in range(1, 13):
+            for lo in range(1, num_users + 1):
+                for hi in range(lo + 1, num_users + 2):
+                    pairs = [(user_id, friend_id)
+                             for user_id in range(lo, hi)
+                             for friend_id in range(user_id + 1, num_users + 1)]
+                    self.assertEqual(_owned_pairs(lo, hi, num_users), len(pairs))
+                    for k, pair in enumerate(pairs):
+                        self.assertEqual(_decode_pair(k, lo, num_users), pair)
+
+    def test_populate_graph_parallel(self):
+        graph = SocialGraph()
+        graph.populate_graph_parallel(500, 6, seed=7, workers=1, chunk_size=64)
+        self.check_friendships(graph, 500, 1500)
+
+        other = SocialGraph()
+        other.populate_graph_parallel(500, 6, seed=7, workers=2, chunk_size=64)
+        self.assertEqual(other.friendships, graph.friendships)
+
+        other.populate_graph_parallel(500, 6, seed=8, workers=1, chunk_size=64)
+        self.assertNotEqual(other.friendships, graph.friendships)
+
+    def check_loaded(self, graph, expected):
+        self.assertEqual(graph.friendships, expected.friendships)
+        self.assertEqual(graph.friendships_counter, expected.friendships_counter)
+        self.assertEqual(set(graph.users), set(expected.users))
+        self.check_networks(graph)
+
+    def test_loaders(self):
+        # duplicates, reversed duplicates and self-friendships
+        pairs = [(1, 2), (2, 1), (3, 3), (2, 5), (5, 2), (4, 5), (1, 2), (6, 1)]
+        expected = SocialGraph()
+        for i in range(7):
+            expected.add_user(f"User {i + 1}")
+        with redirect_stdout(io.StringIO()):
+            for user_id, friend_id in pairs:
+                expected.add_friendship(user_id, friend_id)
+        self.assertEqual(expected.friendships_counter, 4)
+
+        self.check_loaded(SocialGraph.from_edge_list(pairs, num_users=7), expected)
+
+        graph = SocialGraph()
+        for i in range(7):
+            graph.add_user(f"User {i + 1}")
+        self.assertEqual(graph.add_friendships_from(pairs), 4)
+        self.check_loaded(graph, expected)
+
+        # an unknown user raises, keeping the friendships before it
+        with self.assertRaises(IndexError):
+            graph.add_friendships_from([(3, 7), (3, 8), (3, 4)])
+        self.assertEqual(graph.friendships_counter, 5)
+        self.assertIn(7, graph.friendships[3])
+        self.assertNotIn(4, graph.friendships[3])
+        with self.assertRaises(IndexError):
+            SocialGraph.from_edge_list([(1, 2), (0, 1)])
+        with self.assertRaises(IndexError):
+            SocialGraph.from_edge_list([(1, 9)], num_users=5)
+
+    @unittest.skipUnless(np, "needs NumPy")
+    def test_from_numpy(self):
+        pairs = [(1, 2), (2, 1), (3, 3), (2, 5), (5, 2), (4, 5), (1, 2), (6, 1)]
+        expected = SocialGraph.from_edge_list(pairs, num_users=7)
+        src, dst = np.array(pairs).T
+        self.check_loaded(SocialGraph.from_numpy(src, dst, num_users=7), expected)
+
+        expected = SocialGraph.from_edge_list(pairs)
+        self.check_loaded(SocialGraph.from_numpy(src, dst), expected)
+        with self.assertRaises(IndexError):
+            SocialGraph.from_numpy(np.array([1, 9]), np.array([2, 1]), num_users=5)
+        with self.assertRaises(IndexError):
+            SocialGraph.from_numpy(np.array([0]), np.array([1]))
+
+    def test_networks(self):
+        graph = SocialGraph()
+        changes = []
+        graph.add_cache_listener(changes.append)
+        for i in range(6):
+            graph.add_user(f"User {i + 1}")
+        self.assertEqual(changes, [graph] * 6)
+        self.assertEqual([graph.network_size(user_id) for user_id in range(1, 7)], [1] * 6)
+
+        graph.add_friendship(1, 2)
+        self.assertEqual(graph.network_size(1), 2)
+        self.assertTrue(graph.in_same_network(2, 1))
+        self.assertFalse(graph.in_same_network(1, 3))
+
+        self.assertEqual(graph.add_friendships_from([(3, 4), (4, 5), (4, 3), (6, 6)]), 2)
+        self.assertEqual(graph.network_size(5), 3)
+        self.assertFalse(graph.in_same_network(2, 3))
+
+        graph.add_user("User 7")
+        self.assertEqual(graph.network_size(7), 1)
+        graph.component_index()
+        graph.add_friendship(2, 5)
+        self.assertIsNone(graph.component_cache)
+        self.assertEqual(graph.network_size(1), 5)
+        self.assertTrue(graph.in_same_network(1, 3))
+        self.assertFalse(graph.in_same_network(1, 6))
+        self.assertEqual(len(changes), 10)
+
+        # the networks were kept up to date, not rebuilt
+        networks = graph.networks
+        self.assertIs(graph.get_networks(), networks)
+        self.check_networks(graph)
+
+        graph.invalidate_caches()
+        self.assertEqual(len(changes), 11)
+
+    def test_rebuilt_networks(self):
+        # bulk generators drop the networks, get_networks rebuilds them
+        graph = SocialGraph()
+        graph.populate_graph_linear(60, 1)
+        self.assertIsNone(graph.networks)
+        self.check_networks(graph)
+
+        graph = SocialGraph()
+        graph.populate_graph_parallel(60, 1, seed=3, workers=1, chunk_size=16)
+        self.assertIsNone(graph.networks)
+        self.check_networks(graph)
+
+        # and keep them up to date from there
+        user_id, friend_id = next((u, f) for u in graph.users for f in graph.users
+                                  if not graph.in_same_network(u, f))
+        graph.add_friendship(user_id, friend_id)
+        self.check_networks(graph)
+
+    @unittest.skipUnless(np, "needs NumPy")
+    def test_from_numpy_networks(self):
+        graph = SocialGraph.from_numpy(np.array([1, 2, 4, 6]), np.array([2, 3, 5, 6]), num_users=8)
+        self.assertIsNone(graph.networks)
+        self.check_networks(graph)
+        self.assertEqual(graph.network_size(3), 3)
+        graph.add_friendship(3, 4)
+        self.assertEqual(graph.network_size(5), 5)
+        self.check_networks(graph)
+
+    def test_component_index(self):
+        graph = SocialGraph.from_edge_list([(1, 2), (2, 3), (4, 5)], num_users=7)
+        components = graph.connected_components()
+        self.assertEqual(sorted(map(sorted, components)), [[1, 2, 3], [4, 5], [6], [7]])
+
+        index = graph.component_index()
+        self.assertIs(graph.component_index(), index)
+        self.assertEqual(len(index), 4)
+        self.assertTrue(index.same_component(1, 3))
+        self.assertFalse(index.same_component(3, 4))
+        self.assertFalse(index.same_component(6, 7))
+        self.assertEqual([index.size_of(user_id) for user_id in range(1, 8)], [3, 3, 3, 2, 2, 1, 1])
+        self.assertEqual(sorted(index.sizes()), [1, 1, 2, 3])
+        self.assertEqual(index.sizes()[index.component_of(4)], 2)
+
+        # a new friendship merges two networks
+        graph.add_friendship(3, 4)
+        index = graph.component_index()
+        self.assertTrue(index.same_component(1, 5))
+        self.assertEqual(sorted(index.sizes()), [1, 1, 5])
+
+    def test_social_tree(self):
+        tree = self.graph.get_social_tree(1)
+        self.assertIsNone(tree[1])
+        for user_id, parent in tree.items():
+            if parent is not None:
+                self.assertIn(parent, self.graph.friendships[user_id])
+                self.assertIn(parent, tree)
+
+        paths = self.graph.get_all_social_paths(1)
+        self.assertEqual(set(paths), set(tree))
+        for user_id, path in paths.items():
+            self.assertEqual(path[0], 1)
+            self.assertEqual(path[-1], user_id)
+
+    def test_social_path(self):
+        paths = self.graph.get_all_social_paths(1)
+        for user_id in self.graph.users:
+            path = self.graph.get_social_path(1, user_id)
+            if user_id not in paths:
+                self.assertIsNone(path)
+                continue
+            # any shortest path will do, but it has to be a real one
+            self.assertEqual(len(path), len(paths[user_id]))
+            self.assertEqual((path[0], path[-1]), (1, user_id))
+            for a, b in zip(path, path[1:]):
+                self.assertIn(b, self.graph.friendships[a])
+
+        graph = SocialGraph.from_edge_list([(1, 2), (2, 3), (4, 5)], num_users=6)
+        self.assertEqual(graph.get_social_path(1, 3), [1, 2, 3])
+        self.assertEqual(graph.get_social_path(3, 1), [3, 2, 1])
+        self.assertEqual(graph.get_social_path(2, 2), [2])
+        self.assertIsNone(graph.get_social_path(1, 5))
+        self.assertIsNone(graph.get_social_path(6, 1))  # no friends at all
+
+    def test_network_distances(self):
+        sources = [1, 50, 120]
+        distances, nearest = self.graph.get_network_distances(sources)
+        paths = {source: self.graph.get_all_social_paths(source) for source in sources}
+        self.assertEqual(set(distances), set().union(*paths.values()))
+        for user_id, distance in distances.items():
+            # the closest source, the first listed on ties
+            reached = [(len(paths[s][user_id]) - 1, i) for i, s in enumerate(sources)
+                       if user_id in paths[s]]
+            self.assertEqual((distance, sources.index(nearest[user_id])), min(reached))
+
+        graph = SocialGraph.from_edge_list([(1, 2), (2, 3), (3, 4), (5, 6)], num_users=7)
+        distances, nearest = graph.get_network_distances([4, 1])
+        self.assertEqual(distances, {4: 0, 1: 0, 3: 1, 2: 1})
+        self.assertEqual(nearest, {4: 4, 1: 1, 3: 4, 2: 1})
+        with redirect_stdout(io.StringIO()):
+            self.assertIsNone(graph.get_network_distances([1, 8]))
+
+    @unittest.skipUnless(sparse_engine.AVAILABLE, "needs NumPy and SciPy")
+    def test_sparse_engine(self):
+        paths = self.graph.get_all_social_paths(1)
+        sparse_paths = self.graph.get_all_social_paths(1, engine='sparse')
+        self.assertEqual(set(sparse_paths), set(paths))
+        for user_id, path in sparse_paths.items():
+            # any shortest path will do, but it has to be a real one
+            self.assertEqual(len(path), len(paths[user_id]))
+            for a, b in zip(path, path[1:]):
+                self.assertIn(b, self.graph.friendships[a])
+
+        # parents are the lowest-index friend one level up
+        adjacency, user_ids, index = self.graph.get_sparse_adjacency()
+        distances, parents = sparse_engine.sparse_bfs(adjacency, index[1])
+        for i, parent in enumerate(parents):
+            if distances[i] > 0:
+                closer = [index[f] for f in self.graph.friendships[user_ids[i]]
+                          if distances[index[f]] == distances[i] - 1]
+                self.assertEqual(parent, min(closer))
+            else:
+                self.assertEqual(parent, -1)
+
+if __name__ == '__main__':
+    unittest.main()